@@ -1,14 +1,60 @@
 """Brain module: Claude API client with native tool_use agentic loop."""
 
 import anthropic
+import asyncio
+import httpx
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from chandler.config import config
 from chandler.memory import memory
+from chandler.response_cache import response_cache
 from chandler.tools import get_all_tool_schemas, execute_tool
-from chandler.modes import Mode, get_mode_config, get_mode_announcement
+from chandler.modes import Mode, MODE_BY_NAME, get_mode_config, get_mode_announcement
 from chandler import ui
 
+# Greetings/acknowledgements that never need extended thinking or tools
+_TRIVIAL_RE = re.compile(
+    r"^(hi|hiya|hey|hello|howdy|yo|sup|ok(ay)?|thanks?|thank you|thx|bye|goodbye|good (morning|afternoon|evening|night))\b"
+)
+
+
+def _install_orjson_encoder():
+    """Best-effort: route httpx JSON encoding through orjson.
+
+    The anthropic SDK serializes the full conversation (including tool_use /
+    tool_result blocks) through httpx's stdlib json.dumps on every request;
+    orjson is a C encoder that is several times faster on these payloads, and
+    the win compounds as history grows. Both the optional import and the
+    private httpx hook are guarded so any mismatch silently keeps the stdlib
+    encoder.
+    """
+    try:
+        import orjson
+        import httpx._content as _httpx_content
+    except ImportError:
+        return
+
+    if not hasattr(_httpx_content, "json_dumps"):
+        return
+
+    _stdlib_dumps = _httpx_content.json_dumps
+
+    def _dumps(obj, *args, **kwargs):
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson is stricter about types — fall back per payload
+            return _stdlib_dumps(obj, *args, **kwargs)
+
+    _httpx_content.json_dumps = _dumps
+
+
+_install_orjson_encoder()
+
+
 SYSTEM_PROMPT = """You are Chandler, a capable and witty personal AI assistant running on macOS, inspired by Chandler Bing from Friends.
 
 You have access to tools for: web search, web browsing, running Python code, executing shell commands, file operations, macOS system control, vision-based computer control, and memory.
@@ -63,101 +109,190 @@ You have access to tools for: web search, web browsing, running Python code, exe
 {memory_context}
 """
 
+# Pre-split the template so building the prompt is a single join instead of
+# str.format plus repeated += on a multi-KB string
+_PROMPT_PREFIX, _PROMPT_SUFFIX = SYSTEM_PROMPT.split("{memory_context}")
+
+FIRST_MEETING_PROMPT = """
+## 👋 First Meeting Protocol
+
+This appears to be your first conversation with the user (memory is empty).
+
+**IMPORTANT - Be Warm & Curious:**
+1. **Introduce yourself properly**: "Hey! I'm Chandler, your AI assistant. Nice to meet you!"
+2. **Ask for their name**: Early in the conversation, casually ask "What's your name?" or "What should I call you?"
+3. **Show genuine interest**: When they share info, ask natural follow-up questions
+4. **Build rapport**: Be friendly, personable, and make them feel welcome
+5. **Remember what they share**: Automatically save their name, occupation, interests, etc.
+
+**Examples of natural curiosity:**
+- User: "I'm working on a project"
+  You: "Cool! What kind of project? I'd love to help out!"
+- User: "I live in Tokyo"
+  You: "Oh nice! How long have you been in Tokyo? What do you do there?"
+- After learning name: "Great to meet you, [Name]! So what brings you here today?"
+
+**Don't interrogate** - be conversational! Ask questions naturally as the conversation flows.
+Let the user volunteer information organically, but show you're interested in getting to know them.
+"""
+
 
 class Brain:
     """Claude API client with tool_use agentic loop."""
 
     def __init__(self, ui_adapter=None):
+        # Tuned connection pool: the agentic loop fires back-to-back requests,
+        # so generous keep-alive limits let them reuse one TCP+TLS connection
+        # instead of re-handshaking (~50-200ms each)
+        pool_limits = httpx.Limits(
+            max_keepalive_connections=16,
+            max_connections=32,
+            keepalive_expiry=120,
+        )
         self.client = anthropic.Anthropic(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.api_timeout,  # API timeout (default: 300 seconds)
+            http_client=httpx.Client(
+                limits=pool_limits,
+                transport=httpx.HTTPTransport(retries=2),
+            ),
+        )
+        # Async client drives the agentic loop (see chat_async); the sync
+        # client stays for auxiliary one-shot calls like summarization
+        self.async_client = anthropic.AsyncAnthropic(
+            api_key=config.api_key,
+            base_url=config.base_url,
+            timeout=config.api_timeout,
+            http_client=httpx.AsyncClient(
+                limits=pool_limits,
+                transport=httpx.AsyncHTTPTransport(retries=2),
+            ),
         )
         self.conversation: list[dict] = []
         self.ui = ui_adapter if ui_adapter else ui  # Default to Rich UI
         self.session_id = None  # Will be set by memory.start_session()
 
-        # Mode system
-        self.current_mode = Mode.BUDDY  # Default to Buddy Mode
-        self.mode_history = []  # Track mode switches for debugging
+        # Tool schemas are static for the process lifetime — build once instead
+        # of on every iteration of the agentic loop
+        self._tools_cache = get_all_tool_schemas()
 
-    def _build_system_prompt(self, current_message: str = "") -> str:
-        """Build system prompt with optimized memory context.
+        # Single-worker executor keeps auto-save writes ordered while moving
+        # disk IO off the response path
+        self._save_executor = ThreadPoolExecutor(max_workers=1)
 
-        Args:
-            current_message: Current user message for contextual filtering
+        # Small pool for background work that must start immediately (memory
+        # retrieval) rather than waiting for the event loop to run tasks
+        self._bg_executor = ThreadPoolExecutor(max_workers=2)
 
-        Returns:
-            Optimized system prompt
-        """
-        # Get context-aware memory (only includes relevant info)
-        memory_context = memory.get_system_prompt_context(current_message)
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Persistent event loop on a daemon thread: one loop for the process
+        # lifetime keeps the async client's pooled connections valid across
+        # turns (asyncio.run per call would orphan them)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="brain-loop", daemon=True)
+        self._loop_thread.start()
 
-        # Get mode-specific configuration
-        mode_config = get_mode_config(self.current_mode)
-        mode_guidance = mode_config["style_guidance"]
+        # Mode system
+        self.current_mode = Mode.BUDDY  # Default to Buddy Mode
+        self.mode_history = []  # Track mode switches for debugging
 
-        # Build base prompt
-        prompt = SYSTEM_PROMPT.format(memory_context=memory_context)
+        # Static prompt tail per (mode, is_new_user) — built once, reused
+        self._mode_prompt_cache: dict[tuple[Mode, bool], str] = {}
 
-        # Add datetime
-        prompt += f"\n## Current Date and Time\n{current_datetime}\n"
+        # Cleared if the deployment rejects the latency-optimized beta header
+        self._optimized_latency_ok = True
 
-        # Add mode-specific guidance
-        prompt += f"\n## Current Mode: {mode_config['name']}\n{mode_guidance}\n"
+        # In-flight history compaction scheduled at the end of a turn; the
+        # next turn awaits it before touching the conversation
+        self._compaction_task = None
 
-        # Add first meeting guidance if memory is empty
-        if memory.is_new_user():
-            prompt += """
-## 👋 First Meeting Protocol
+    def _build_system_prompt(self, memory_context: str = "") -> str:
+        """Build the cacheable portion of the system prompt.
 
-This appears to be your first conversation with the user (memory is empty).
+        Deliberately excludes volatile data like the current datetime so the
+        result stays byte-identical between calls and can be served from the
+        Anthropic prompt cache (see _build_api_params).
 
-**IMPORTANT - Be Warm & Curious:**
-1. **Introduce yourself properly**: "Hey! I'm Chandler, your AI assistant. Nice to meet you!"
-2. **Ask for their name**: Early in the conversation, casually ask "What's your name?" or "What should I call you?"
-3. **Show genuine interest**: When they share info, ask natural follow-up questions
-4. **Build rapport**: Be friendly, personable, and make them feel welcome
-5. **Remember what they share**: Automatically save their name, occupation, interests, etc.
-
-**Examples of natural curiosity:**
-- User: "I'm working on a project"
-  You: "Cool! What kind of project? I'd love to help out!"
-- User: "I live in Tokyo"
-  You: "Oh nice! How long have you been in Tokyo? What do you do there?"
-- After learning name: "Great to meet you, [Name]! So what brings you here today?"
-
-**Don't interrogate** - be conversational! Ask questions naturally as the conversation flows.
-Let the user volunteer information organically, but show you're interested in getting to know them.
-"""
+        Args:
+            memory_context: Precomputed memory context for the current turn
+                (see memory.get_system_prompt_context)
 
-        return prompt
+        Returns:
+            Optimized system prompt
+        """
+        # Mode guidance and the first-meeting block are static per
+        # (mode, is_new_user) — build that tail once and cache it
+        cache_key = (self.current_mode, memory.is_new_user())
+        tail = self._mode_prompt_cache.get(cache_key)
+        if tail is None:
+            mode_config = get_mode_config(self.current_mode)
+            tail = f"\n## Current Mode: {mode_config.name}\n{mode_config.style_guidance}\n"
+            if cache_key[1]:
+                tail += FIRST_MEETING_PROMPT
+            self._mode_prompt_cache[cache_key] = tail
+
+        # Single join — no intermediate multi-KB strings
+        return "".join((_PROMPT_PREFIX, memory_context, _PROMPT_SUFFIX, tail))
+
+    @staticmethod
+    def _is_trivial(message: str) -> bool:
+        """Cheap classifier for greetings/acknowledgements.
+
+        These turns need neither extended thinking nor tools, so detecting
+        them lets _build_api_params skip thousands of billed tokens.
+        """
+        return len(message) < 24 and bool(_TRIVIAL_RE.match(message.strip().lower()))
 
-    def _build_api_params(self, current_message: str = "") -> dict:
+    def _build_api_params(self, memory_context: str = "",
+                          current_datetime: str = "",
+                          trivial: bool = False) -> dict:
         """Build API parameters including mode-specific settings.
 
         Args:
-            current_message: Current user message for context optimization
+            memory_context: Precomputed memory context for the current turn
+            current_datetime: Preformatted timestamp for the current turn
+            trivial: True when the message is a greeting/acknowledgement —
+                strips thinking and tools and shrinks max_tokens
 
         Returns:
             API parameters dict
         """
         mode_config = get_mode_config(self.current_mode)
+        if not current_datetime:
+            current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # The static prompt gets a cache breakpoint; the datetime lives in a
+        # separate block AFTER it so the cached prefix never changes between calls.
+        system_blocks = [
+            {
+                "type": "text",
+                "text": self._build_system_prompt(memory_context),
+                "cache_control": {"type": "ephemeral"},
+            },
+            {
+                "type": "text",
+                "text": f"## Current Date and Time\n{current_datetime}",
+            },
+        ]
 
         params = {
             "model": config.claude_model,
-            "max_tokens": mode_config["max_tokens"],
-            "system": self._build_system_prompt(current_message),
-            "tools": get_all_tool_schemas(),
+            "max_tokens": mode_config.max_tokens,
+            "system": system_blocks,
+            "tools": self._tools_cache,
             "messages": self.conversation,
         }
 
+        # Opt into latency-optimized serving where the deployment supports it
+        if config.optimized_latency and self._optimized_latency_ok:
+            params["extra_headers"] = {"anthropic-beta": config.optimized_latency}
+
         # Add extended thinking based on mode configuration
-        if mode_config["extended_thinking"]:
+        if mode_config.extended_thinking:
             params["thinking"] = {
                 "type": "enabled",
-                "budget_tokens": mode_config["budget_tokens"]
+                "budget_tokens": mode_config.budget_tokens
             }
         # Override with global config if explicitly enabled
         elif config.extended_thinking.get("enabled"):
@@ -166,35 +301,325 @@ Let the user volunteer information organically, but show you're interested in ge
                 "budget_tokens": config.extended_thinking["budget_tokens"]
             }
 
+        if trivial:
+            # Short greeting: no thinking budget, small reply. Tool schemas
+            # can only be dropped while the history is tool-free — the API
+            # rejects conversations holding tool_use/tool_result blocks
+            # when no tools are defined.
+            if not self._conversation_has_tool_blocks():
+                params["tools"] = []
+            params["max_tokens"] = min(256, params["max_tokens"])
+            params.pop("thinking", None)
+
         return params
 
+    def _conversation_has_tool_blocks(self) -> bool:
+        """True if any persisted message carries tool_use/tool_result blocks."""
+        for message in self.conversation:
+            content = message.get("content")
+            if not isinstance(content, list):
+                continue
+            for block in content:
+                if isinstance(block, dict):
+                    if block.get("type") in ("tool_use", "tool_result"):
+                        return True
+                elif getattr(block, "type", "") == "tool_use":
+                    # SDK content blocks from assistant turns
+                    return True
+        return False
+
+    def invalidate_tools(self):
+        """Rebuild the cached tool schemas (only needed if tools are registered
+        after Brain construction)."""
+        self._tools_cache = get_all_tool_schemas()
+
+    def _mark_conversation_cache_breakpoint(self):
+        """Place a prompt-cache breakpoint on the second-to-last message.
+
+        Marking the second-to-last message turns the whole conversation prefix
+        into a cache hit on the next API call (the last message is the new
+        content Claude hasn't seen). The previous breakpoint is removed first so
+        we never exceed Anthropic's 4-breakpoint limit. Assistant turns holding
+        raw SDK content blocks are left untouched — only dict/str content we
+        built ourselves is marked.
+        """
+        # Remove any breakpoint placed on a previous call
+        for message in self.conversation:
+            content = message.get("content")
+            if isinstance(content, list):
+                for block in content:
+                    if isinstance(block, dict):
+                        block.pop("cache_control", None)
+
+        if len(self.conversation) < 2:
+            return
+
+        target = self.conversation[-2]
+        content = target.get("content")
+        if isinstance(content, str):
+            target["content"] = [{
+                "type": "text",
+                "text": content,
+                "cache_control": {"type": "ephemeral"},
+            }]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            content[-1]["cache_control"] = {"type": "ephemeral"}
+
+    @staticmethod
+    def _message_to_text(message: dict) -> str:
+        """Flatten a conversation message into plain text for summarization."""
+        role = message.get("role", "")
+        content = message.get("content")
+
+        if isinstance(content, str):
+            return f"{role}: {content}"
+
+        parts = []
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict):
+                    if block.get("type") == "text":
+                        parts.append(block.get("text", ""))
+                    elif block.get("type") == "tool_result":
+                        parts.append(f"[tool result] {str(block.get('content'))[:200]}")
+                else:
+                    # SDK content blocks from assistant turns
+                    block_type = getattr(block, "type", "")
+                    if block_type == "text":
+                        parts.append(block.text)
+                    elif block_type == "tool_use":
+                        parts.append(f"[called tool {block.name}]")
+
+        return f"{role}: {' '.join(parts)}" if parts else ""
+
+    def _summarize_messages(self, messages: list[dict]) -> str | None:
+        """Summarize old conversation turns with the cheap summarizer model."""
+        transcript = "\n".join(
+            text for text in (self._message_to_text(m) for m in messages) if text
+        )
+        if not transcript:
+            return None
+
+        try:
+            response = self.client.messages.create(
+                model=config.summarizer_model,
+                max_tokens=400,
+                messages=[{
+                    "role": "user",
+                    "content": (
+                        "Summarize this conversation excerpt in at most 300 tokens. "
+                        "Preserve user facts, decisions, and any unfinished tasks.\n\n"
+                        f"{transcript}"
+                    ),
+                }],
+            )
+            return response.content[0].text if response.content else None
+        except Exception:
+            # Summarization is best-effort — keep full history on failure
+            return None
+
+    def _compact_conversation(self):
+        """Cap prefill cost with a sliding window over conversation history.
+
+        Long sessions make every API call reprocess the entire history. Once
+        the conversation exceeds twice the configured window, replace the
+        oldest turns with a single summarized exchange and keep the recent
+        turns verbatim. The cut lands on a plain user message so assistant
+        tool_use blocks never get separated from their tool_result replies.
+
+        Runs in a worker thread between turns (scheduled at the end of
+        chat_async, awaited at the start of the next) so the synchronous
+        summarizer call never stalls the event loop or a user-facing turn.
+        """
+        max_turns = config.max_context_turns
+        if len(self.conversation) <= 2 * max_turns:
+            return
+
+        def is_plain_user(message: dict) -> bool:
+            if message.get("role") != "user":
+                return False
+            content = message.get("content")
+            if isinstance(content, str):
+                return True
+            return isinstance(content, list) and all(
+                isinstance(b, dict) and b.get("type") == "text" for b in content
+            )
+
+        start = len(self.conversation) - max_turns
+        cut = next(
+            (i for i in range(start, len(self.conversation))
+             if is_plain_user(self.conversation[i])),
+            None,
+        )
+        if cut is None or cut == 0:
+            return
+
+        summary = self._summarize_messages(self.conversation[:cut])
+        if not summary:
+            return
+
+        self.conversation = [
+            {"role": "user", "content": f"[Prior conversation summary]: {summary}"},
+            {"role": "assistant", "content": "Noted — continuing from that summary."},
+        ] + self.conversation[cut:]
+
+    async def _create_message(self, params: dict):
+        """messages.create with graceful fallback for the latency beta header.
+
+        If the deployment rejects the optimized-latency beta, retry once
+        without it and stop sending it for the rest of the session.
+        """
+        try:
+            return await self.async_client.messages.create(**params)
+        except anthropic.BadRequestError:
+            if "extra_headers" not in params:
+                raise
+            params.pop("extra_headers", None)
+            self._optimized_latency_ok = False
+            return await self.async_client.messages.create(**params)
+
+    async def _stream_response(self, params: dict):
+        """Call the API in streaming mode, displaying text as it arrives.
+
+        Cuts perceived latency from full-response time to time-to-first-token.
+        Returns the final Message object so the tool_use loop downstream works
+        identically to the blocking path.
+        """
+        async with self.async_client.messages.stream(**params) as stream:
+            async for chunk in stream.text_stream:
+                self.ui.print_streaming_text(chunk)
+            response = await stream.get_final_message()
+        self.ui.print_streaming_text("\n")
+        return response
+
+    def _render_tool_outcomes(self, display_queue, mode_switch_announcement):
+        """Render buffered tool results (runs in a thread while the next API
+        request is in flight on the event loop)."""
+        for tool_name, kind, result in display_queue:
+            if kind == "error":
+                self.ui.print_tool_error(tool_name, result)
+            else:
+                self.ui.print_tool_result(tool_name, result)
+
+        # If mode switched, show announcement before next iteration
+        if mode_switch_announcement:
+            self.ui.print_assistant(mode_switch_announcement)
+
     def chat(self, user_message: str) -> str:
+        """Synchronous entry point — runs the async agentic loop to completion.
+
+        Kept for the CLI REPL and voice controller, which call from plain
+        threads without an event loop. The coroutine runs on the Brain's
+        persistent loop so HTTP connections stay pooled between turns.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.chat_async(user_message), self._loop)
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            # Ctrl+C raises here in the REPL thread; without the cancel the
+            # coroutine would keep running tools and appending to
+            # self.conversation concurrently with the next turn
+            future.cancel()
+            raise
+
+    async def chat_async(self, user_message: str) -> str:
         """Process a user message through the agentic tool_use loop.
 
         Sends the message to Claude, executes any tool calls, sends results back,
         and loops until Claude responds with only text (no tool calls).
+        Concurrency (parallel tool calls, speculative next request, streaming)
+        runs on the event loop; blocking work is pushed to threads.
 
         Returns the final text response.
         """
+        # A compaction scheduled by the previous turn may still be rewriting
+        # self.conversation in a worker thread — join it before this turn
+        # reads or appends history
+        if self._compaction_task is not None:
+            try:
+                await self._compaction_task
+            except Exception:
+                pass  # compaction is best-effort
+            self._compaction_task = None
+
+        # Only messages the greeting classifier accepts touch the cache —
+        # length alone admits context-dependent turns ("yes", "why?",
+        # "continue") whose replies must never be replayed verbatim in a
+        # different conversation
+        trivial = self._is_trivial(user_message)
+
+        # Small-talk turns can be answered from the local semantic cache
+        # without an API round-trip
+        cached_response = response_cache.lookup(user_message) if trivial else None
+        if cached_response is not None:
+            self.conversation.append({"role": "user", "content": user_message})
+            self.conversation.append({"role": "assistant", "content": cached_response})
+            self._save_executor.submit(memory.auto_save_message, "user", user_message)
+            self._save_executor.submit(memory.auto_save_message, "assistant", cached_response)
+            return cached_response
+
+        # Kick off memory retrieval immediately — it's on the critical path
+        # before the first API call, so let it run concurrently with history
+        # compaction and the rest of the pre-request bookkeeping. Submitted to
+        # a real thread (not a loop task) so it starts right away. The result
+        # is fixed for the whole turn, so one retrieval covers every iteration.
+        memory_context_future = self._bg_executor.submit(
+            memory.get_system_prompt_context, user_message)
+
         self.conversation.append({"role": "user", "content": user_message})
 
-        # Auto-save user message to memory
-        memory.auto_save_message("user", user_message)
+        # Auto-save user message to memory (in the background, off the hot path)
+        self._save_executor.submit(memory.auto_save_message, "user", user_message)
 
         final_text = ""
+        used_tools = False
+
+        # strftime once per turn instead of per iteration
+        turn_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Join the concurrent retrieval right before composing params
+        memory_context = await asyncio.wrap_future(memory_context_future)
+
+        # Params are stable across loop iterations: messages points at
+        # self.conversation by reference, and everything else only changes on
+        # a mode switch — so build once and rebuild only when the mode flips
+        params = self._build_api_params(
+            memory_context, turn_datetime, trivial=trivial)
+
+        # Task for a speculatively-submitted API call (see end of loop)
+        pending_response = None
 
         while True:
-            with self.ui.get_spinner("Thinking..."):
-                # Build params with context optimization (only first iteration uses user message)
-                response = self.client.messages.create(**self._build_api_params(user_message))
+            if pending_response is not None:
+                # Request was already submitted while tool output rendered
+                with self.ui.get_spinner("Thinking..."):
+                    response = await pending_response
+                pending_response = None
+            else:
+                self._mark_conversation_cache_breakpoint()
+
+                if config.streaming:
+                    # Streaming prints text as it arrives — no spinner needed
+                    response = await self._stream_response(params)
+                else:
+                    with self.ui.get_spinner("Thinking..."):
+                        response = await self._create_message(params)
 
-            # Process response content blocks
-            text_parts = []
+            # Process response content blocks. The common case is a single text
+            # block with no tools — handle it without list churn or a join.
+            first_text = None
+            text_parts = None
             tool_uses = []
 
             for block in response.content:
                 if block.type == "text":
-                    text_parts.append(block.text)
+                    if first_text is None:
+                        first_text = block.text
+                    elif text_parts is None:
+                        text_parts = [first_text, block.text]
+                    else:
+                        text_parts.append(block.text)
                 elif block.type == "tool_use":
                     tool_uses.append(block)
                 elif block.type == "thinking":
@@ -203,86 +628,107 @@ Let the user volunteer information organically, but show you're interested in ge
                     pass
 
             # If there's text, display it
-            if text_parts:
+            if text_parts is not None:
                 final_text = "\n".join(text_parts)
+            elif first_text is not None:
+                final_text = first_text
 
             # If no tool calls, we're done
             if not tool_uses:
                 self.conversation.append({"role": "assistant", "content": response.content})
-                # Auto-save assistant message to memory
-                memory.auto_save_message("assistant", final_text)
+                # Auto-save assistant message to memory (in the background)
+                self._save_executor.submit(memory.auto_save_message, "assistant", final_text)
+                # Only tool-free turns the classifier called trivial are
+                # genuine small talk worth caching
+                if trivial and not used_tools:
+                    response_cache.store(user_message, final_text)
                 break
 
             # There are tool calls — execute them
+            used_tools = True
             self.conversation.append({"role": "assistant", "content": response.content})
 
+            for tool_block in tool_uses:
+                self.ui.print_tool_call(tool_block.name, tool_block.input)
+
+            # Tool execution is IO-bound (HTTP, subprocess, filesystem), so run
+            # independent tool_use blocks concurrently. gather preserves
+            # submission order, keeping UI output and result pairing deterministic.
+            results = await asyncio.gather(*(
+                asyncio.to_thread(execute_tool, block.name, block.input)
+                for block in tool_uses
+            ))
+
             tool_results = []
+            display_queue = []
             mode_switch_announcement = None
 
-            for tool_block in tool_uses:
+            for tool_block, outcome in zip(tool_uses, results):
                 tool_name = tool_block.name
-                tool_input = tool_block.input
-
-                self.ui.print_tool_call(tool_name, tool_input)
-
-                result = execute_tool(tool_name, tool_input)
-
-                # Check for mode switch
-                if result.startswith("MODE_SWITCH:"):
-                    # Parse mode switch: MODE_SWITCH:mode:reason
-                    parts = result.split(":", 2)
-                    if len(parts) >= 2:
-                        new_mode_str = parts[1]
-                        reason = parts[2] if len(parts) > 2 else ""
-
-                        # Switch mode
-                        if new_mode_str == "buddy":
-                            new_mode = Mode.BUDDY
-                        elif new_mode_str == "research":
-                            new_mode = Mode.RESEARCH
-                        else:
-                            new_mode = None
-
-                        if new_mode and new_mode != self.current_mode:
-                            old_mode = self.current_mode
-                            self.current_mode = new_mode
-
-                            # Log mode switch
-                            self.mode_history.append({
-                                "from": old_mode.value,
-                                "to": new_mode.value,
-                                "reason": reason,
-                                "timestamp": datetime.now().isoformat()
-                            })
-
-                            # Generate announcement
-                            mode_switch_announcement = get_mode_announcement(new_mode, reason)
-
-                            # Return success to tool
-                            result = f"Mode switched to {new_mode.value}"
-
-                if result.startswith("Error"):
-                    self.ui.print_tool_error(tool_name, result)
-                else:
-                    self.ui.print_tool_result(tool_name, result)
+                result = outcome.content
+
+                # Handle mode switch outcomes
+                if outcome.kind == "mode_switch":
+                    new_mode = MODE_BY_NAME.get(outcome.mode)
+
+                    if new_mode and new_mode != self.current_mode:
+                        old_mode = self.current_mode
+                        self.current_mode = new_mode
+
+                        # Log mode switch
+                        self.mode_history.append({
+                            "from": old_mode.value,
+                            "to": new_mode.value,
+                            "reason": outcome.reason,
+                            "timestamp": datetime.now().isoformat()
+                        })
 
+                        # Generate announcement
+                        mode_switch_announcement = get_mode_announcement(new_mode, outcome.reason)
+
+                        # Return success to tool
+                        result = f"Mode switched to {new_mode.value}"
+
+                display_queue.append((tool_name, outcome.kind, result))
                 tool_results.append({
                     "type": "tool_result",
                     "tool_use_id": tool_block.id,
                     "content": result,
                 })
 
-            # If mode switched, show announcement before next iteration
-            if mode_switch_announcement:
-                self.ui.print_assistant(mode_switch_announcement)
-
             # Send tool results back to Claude for next iteration
             self.conversation.append({"role": "user", "content": tool_results})
 
+            # A mode switch changes max_tokens/thinking — only then rebuild params
+            if mode_switch_announcement:
+                params = self._build_api_params(memory_context, turn_datetime)
+
+            # Speculatively submit the next API call (mode switches are already
+            # applied above, so params are final), then render tool output in a
+            # thread so the event loop keeps driving the in-flight request —
+            # network RTT overlaps with terminal rendering
+            if not config.streaming:
+                self._mark_conversation_cache_breakpoint()
+                pending_response = asyncio.ensure_future(self._create_message(params))
+                await asyncio.to_thread(
+                    self._render_tool_outcomes, display_queue, mode_switch_announcement)
+            else:
+                self._render_tool_outcomes(display_queue, mode_switch_announcement)
+
+        # Compaction makes a blocking summarizer call, so it runs in a
+        # thread (the loop keeps serving other work) and is scheduled after
+        # the turn completes — the summarization happens while the user
+        # reads the reply instead of inside a user-facing turn
+        if len(self.conversation) > 2 * config.max_context_turns:
+            self._compaction_task = asyncio.ensure_future(
+                asyncio.to_thread(self._compact_conversation))
+
         return final_text
 
     def finalize_session(self):
         """Finalize the current session (called on graceful shutdown)."""
+        # Drain any pending background saves before committing
+        self._save_executor.shutdown(wait=True)
         if self.session_id:
             memory.commit_session(self.session_id)
 
@@ -301,7 +747,7 @@ Let the user volunteer information organically, but show you're interested in ge
             Formatted mode status string
         """
         mode_config = get_mode_config(self.current_mode)
-        return f"{mode_config['emoji']} {mode_config['name']}"
+        return f"{mode_config.emoji} {mode_config.name}"
 
     def clear_conversation(self):
         """Clear conversation history."""
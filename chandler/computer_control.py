@@ -4,33 +4,40 @@ Captures screenshots, sends to a vision LLM for analysis, and executes
 mouse/keyboard actions based on the LLM's instructions.
 """
 
+import asyncio
 import base64
 import json
-import os
 import platform
-import re
-import tempfile
+import subprocess
 import time
 
 import cv2
+import httpx
 import numpy as np
 import pyautogui
 import pyperclip
+from collections import OrderedDict
 
-from chandler.config import config
+try:
+    # C JSON parser, ~3-5x faster than stdlib on small payloads
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    # mss grabs the screen as native BGRA — no PIL detour, no RGB→BGR pass
+    import mss
+except ImportError:
+    mss = None
 
-# macOS window management
-if platform.system() == "Darwin":
-    from Quartz import (
-        CGWindowListCopyWindowInfo,
-        kCGWindowListOptionOnScreenOnly,
-        kCGNullWindowID,
-    )
-    from AppKit import NSWorkspace
+from chandler.config import config
 
 # Safety: disable PyAutoGUI failsafe by default (we have our own safety)
 pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.1
+# No implicit pause after every pyautogui call — actions that need settle
+# time sleep explicitly, instead of every moveTo/click paying 100 ms
+pyautogui.PAUSE = 0
 
 SYSTEM_PROMPT = """You are a computer vision assistant that controls a macOS desktop.
 You will receive a screenshot of the current screen and an objective to accomplish.
@@ -56,6 +63,86 @@ Rules:
 - Only output valid JSON, no other text
 """
 
+# Hotkey modifier spellings the model uses → pyautogui key names
+_KEY_ALIASES = {"win": "command", "meta": "command", "cmd": "command"}
+
+# Single-point action dispatch: one dict lookup replaces an if/elif chain
+# of string comparisons. All handlers run after the cursor has moved to
+# the mapped coordinates.
+_POINT_ACTIONS = {
+    "click": pyautogui.click,
+    "double_click": pyautogui.doubleClick,
+    "right_click": pyautogui.rightClick,
+    "scroll_up": lambda: pyautogui.scroll(500),
+    "scroll_down": lambda: pyautogui.scroll(-500),
+    "input": lambda: (pyautogui.click(), time.sleep(0.3)),
+}
+
+
+def _extract_json_object(text):
+    """Return the first balanced {...} span in text, or None.
+
+    One forward pass tracking brace depth (skipping braces inside quoted
+    strings) instead of a DOTALL regex over the whole reply; code fences
+    fall out naturally since scanning starts at the first brace.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class VisionResponseCache:
+    """LRU cache of parsed vision-LLM actions keyed by screenshot hash.
+
+    During wait loops and idempotent actions the screen barely changes
+    between iterations. When a screenshot's perceptual hash is within a small
+    Hamming distance of a cached entry for the same objective, the model
+    would see essentially the same input — so the previous parsed action is
+    replayed without paying the HTTP + inference cost (~seconds per hit).
+    """
+
+    def __init__(self, max_entries: int = 256, max_distance: int = 5):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, phash: int, objective: str):
+        """Return a cached parsed response for a near-identical screen."""
+        for (cached_hash, cached_objective), parsed in self._entries.items():
+            if cached_objective != objective:
+                continue
+            if bin(cached_hash ^ phash).count("1") <= self.max_distance:
+                self._entries.move_to_end((cached_hash, cached_objective))
+                return parsed
+        return None
+
+    def put(self, phash: int, objective: str, parsed: dict):
+        self._entries[(phash, objective)] = parsed
+        self._entries.move_to_end((phash, objective))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
 
 class ComputerController:
     """Vision-based GUI automation controller."""
@@ -66,21 +153,44 @@ class ComputerController:
 
         self.max_iterations = cc_config.get("max_iterations", 15)
         self.timeout = cc_config.get("timeout", 180)
-        self.max_screenshot_size = cc_config.get("screenshot_max_size", 1280)
+        # 1024 long edge matches the internal tile size of common vision
+        # models — larger captures just cost extra encode/upload bytes
+        self.max_screenshot_size = cc_config.get("screenshot_max_size", 1024)
         self.active_window_only = cc_config.get("active_window_only", False)
 
         self.api_key = vm_config.get("api_key", "")
         self.base_url = vm_config.get("base_url", "https://api.openai.com/v1")
         self.model_name = vm_config.get("model_name", "gpt-4o")
 
-        self._screenshot_dir = tempfile.mkdtemp(prefix="chandler_")
-        self._screenshot_path = os.path.join(self._screenshot_dir, "screen.png")
-        self._history = []
+        # Screenshot lives in memory only — it's consumed within the iteration
+        self._screenshot_url = ""
+        self._img_h = 0
+        self._img_w = 0
+        # Model-space → screen-space transform, refreshed per capture
+        self._coord_scale = np.ones(2)
+        self._coord_offset = np.zeros(2)
+        # Compact text log of prior steps sent instead of full chat history
+        self._rolling_summary = ""
         self._should_exit = False
+        self._llm = None  # AsyncOpenAI client, created per run
+        self._response_cache = VisionResponseCache()
+        self._screen_phash = 0
 
     def _get_active_window_bounds(self):
         """Get active window bounds on macOS."""
+        if platform.system() != "Darwin":
+            return None
         try:
+            # PyObjC frameworks load lazily here — only runs with
+            # active_window_only enabled, so full-screen captures (the
+            # default) never pay the framework import
+            from Quartz import (
+                CGWindowListCopyWindowInfo,
+                kCGWindowListOptionOnScreenOnly,
+                kCGNullWindowID,
+            )
+            from AppKit import NSWorkspace
+
             workspace = NSWorkspace.sharedWorkspace()
             active_app = workspace.frontmostApplication()
             if not active_app:
@@ -105,44 +215,84 @@ class ComputerController:
         """Capture screenshot and return (scale_factor, window_offset)."""
         window_offset = {"x": 0, "y": 0}
 
+        region = None
         if self.active_window_only:
             bounds = self._get_active_window_bounds()
             if bounds:
                 x, y, w, h = bounds
                 window_offset = {"x": x, "y": y}
-                screenshot = pyautogui.screenshot(region=(x, y, w, h))
+                region = (x, y, w, h)
+
+        if mss is not None:
+            # BGRA straight from the compositor: one cvtColor pass to BGR,
+            # versus PIL materializing an RGB copy and a second channel-swap
+            # pass over the full frame
+            with mss.mss() as sct:
+                if region:
+                    x, y, w, h = region
+                    shot = sct.grab({"left": x, "top": y, "width": w, "height": h})
+                else:
+                    # monitors[0] is the all-monitors virtual screen (whose
+                    # origin can even be negative); monitors[1] is the
+                    # primary display, matching pyautogui.screenshot() and
+                    # the coordinate space the click transform assumes
+                    shot = sct.grab(sct.monitors[1])
+            raw = np.frombuffer(shot.bgra, dtype=np.uint8).reshape(
+                shot.height, shot.width, 4)
+            img = cv2.cvtColor(raw, cv2.COLOR_BGRA2BGR)
+        else:
+            if region:
+                screenshot = pyautogui.screenshot(region=region)
             else:
                 screenshot = pyautogui.screenshot()
-        else:
-            screenshot = pyautogui.screenshot()
-
-        img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            img = cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
 
-        # Resize if needed
-        scale = 1.0
-        h, w = img.shape[:2]
-        max_edge = max(h, w)
+        # Resize if needed; dimensions are snapped down to multiples of 14
+        # (the usual ViT patch size) so the model server doesn't pad
+        capture_h, capture_w = img.shape[:2]
+        max_edge = max(capture_h, capture_w)
         if max_edge > self.max_screenshot_size:
             scale = self.max_screenshot_size / max_edge
-            img = cv2.resize(img, None, fx=scale, fy=scale)
-
-        cv2.imwrite(self._screenshot_path, img, [int(cv2.IMWRITE_PNG_COMPRESSION), 1])
-        return scale, window_offset
+            new_w = max(14, int(capture_w * scale) // 14 * 14)
+            new_h = max(14, int(capture_h * scale) // 14 * 14)
+            img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+        # 8x8 average hash: cheap perceptual fingerprint for the response cache
+        small = cv2.resize(
+            cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), (8, 8),
+            interpolation=cv2.INTER_AREA,
+        )
+        bits = (small > small.mean()).flatten()
+        self._screen_phash = int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+        # JPEG in memory: the screenshot is consumed within a second, so a
+        # fast lossy encode beats PNG (~5-10x less encode CPU, 3-5x fewer
+        # bytes to base64 and upload) and skips the disk round-trips entirely
+        ok, buf = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+        if not ok:
+            raise RuntimeError("Failed to encode screenshot")
+        # The complete data URL is built here too: _capture_screen runs in a
+        # worker thread, so the CPU-bound base64 encode and the ~0.5 MB
+        # string concatenation both stay off the event loop driving the LLM
+        # call, which just references the finished string
+        self._screenshot_url = (
+            "data:image/jpeg;base64,"
+            + base64.b64encode(buf.tobytes()).decode("ascii")
+        )
+        self._img_h, self._img_w = img.shape[:2]
 
-    def _get_screenshot_base64(self):
-        """Read screenshot and return base64 string."""
-        with open(self._screenshot_path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
+        # Fold capture size, resize scale and window offset into one
+        # multiply-add so _map_coordinates is a single vector op. Model
+        # coords are fractions of the image, so resizing cancels out and the
+        # transform reduces to the pre-resize capture dimensions / 1000.
+        self._coord_scale = np.array([capture_w, capture_h]) / 1000.0
+        self._coord_offset = np.array(
+            [window_offset["x"], window_offset["y"]], dtype=float)
 
-    def _call_vision_llm(self, objective):
+    async def _call_vision_llm(self, objective):
         """Send screenshot + objective to vision LLM and get response."""
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key, base_url=self.base_url)
-        screenshot_b64 = self._get_screenshot_base64()
-
         # Build message
-        if self._history:
+        if self._rolling_summary:
             user_text = f"Continue the task: {objective}. Here is the current screen:"
         else:
             user_text = objective
@@ -151,68 +301,50 @@ class ComputerController:
             "role": "user",
             "content": [
                 {"type": "text", "text": user_text},
-                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{screenshot_b64}"}},
+                {"type": "image_url", "image_url": {"url": self._screenshot_url}},
             ],
         }
-        self._history.append(user_message)
 
-        # Build messages list with image management
+        # Prior steps go in as one compact summary line per action instead of
+        # replaying a 5-message window: prompt tokens stay O(1) across
+        # iterations and no per-call image stripping is needed
         messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-        recent = self._history[-5:]
-        for i, msg in enumerate(recent):
-            if i < len(recent) - 2 and isinstance(msg.get("content"), list):
-                # Remove images from older messages
-                cleaned = {"role": msg["role"], "content": [
-                    p for p in msg["content"] if p.get("type") != "image_url"
-                ]}
-                messages.append(cleaned)
-            else:
-                messages.append(msg)
-
-        response = client.chat.completions.create(
+        if self._rolling_summary:
+            messages.append({
+                "role": "user",
+                "content": f"Prior steps:\n{self._rolling_summary}",
+            })
+        messages.append(user_message)
+
+        response = await self._llm.chat.completions.create(
             model=self.model_name,
             messages=messages,
             max_tokens=1000,
             temperature=0.1,
         )
 
-        ai_text = response.choices[0].message.content
-        self._history.append({"role": "assistant", "content": ai_text})
-        return ai_text
+        return response.choices[0].message.content
 
     def _parse_response(self, text):
         """Parse JSON response from vision LLM."""
-        # Try to extract JSON from code blocks
-        if "```" in text:
-            match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-            if match:
-                text = match.group(1)
-        try:
-            return json.loads(text.strip())
-        except json.JSONDecodeError:
-            return {"status": "failed", "description": "Failed to parse response", "action": {"type": "wait"}}
-
-    def _map_coordinates(self, x, y, scale, img_width, img_height, window_offset):
-        """Map coordinates from model space (0-1000) to screen space."""
-        # Read image dimensions
-        img = cv2.imread(self._screenshot_path)
-        if img is not None:
-            img_height, img_width = img.shape[:2]
-
-        x_abs = (x / 1000) * img_width
-        y_abs = (y / 1000) * img_height
-
-        # Apply scale
-        x_screen = x_abs / scale
-        y_screen = y_abs / scale
+        span = _extract_json_object(text)
+        if span is not None:
+            try:
+                return _json_loads(span)
+            except ValueError:
+                pass
+        return {"status": "failed", "description": "Failed to parse response", "action": {"type": "wait"}}
 
-        # Apply window offset
-        x_screen += window_offset.get("x", 0)
-        y_screen += window_offset.get("y", 0)
+    def _map_coordinates(self, coords):
+        """Map model-space (0-1000) coordinates to screen space.
 
-        return max(0, x_screen), max(0, y_screen)
+        Accepts one [x, y] pair or an (N, 2) array; the whole transform is a
+        single fused multiply-add over constants precomputed per capture.
+        """
+        return np.maximum(
+            0, np.asarray(coords, dtype=float) * self._coord_scale + self._coord_offset)
 
-    def _execute_action(self, action, scale, window_offset):
+    def _execute_action(self, action):
         """Execute a parsed action dict."""
         action_type = action.get("type", "wait")
         coordinates = action.get("coordinates", [])
@@ -222,37 +354,25 @@ class ComputerController:
             time.sleep(1)
             return "Waiting..."
 
-        # Read image dimensions
-        img = cv2.imread(self._screenshot_path)
-        img_h, img_w = (img.shape[:2] if img is not None else (1000, 1000))
-
         if action_type == "hotkey" and text:
             # Optional focus click
             if coordinates and len(coordinates) >= 2 and not isinstance(coordinates[0], list):
                 x, y = coordinates
                 if not (x == 0 and y == 0):
-                    sx, sy = self._map_coordinates(x, y, scale, img_w, img_h, window_offset)
+                    sx, sy = self._map_coordinates((x, y))
                     pyautogui.click(sx, sy)
                     time.sleep(0.1)
 
-            keys = text.strip().split()
-            normalized = []
-            for k in keys:
-                kl = k.lower()
-                if kl in ("win", "meta", "cmd"):
-                    normalized.append("command")
-                else:
-                    normalized.append(kl)
+            normalized = [
+                _KEY_ALIASES.get(kl, kl)
+                for kl in (k.lower() for k in text.strip().split())
+            ]
             pyautogui.hotkey(*normalized)
             return f"Hotkey: {'+'.join(normalized)}"
 
         if action_type == "drag" and isinstance(coordinates[0], list):
-            sx, sy = self._map_coordinates(
-                coordinates[0][0], coordinates[0][1], scale, img_w, img_h, window_offset
-            )
-            ex, ey = self._map_coordinates(
-                coordinates[1][0], coordinates[1][1], scale, img_w, img_h, window_offset
-            )
+            # Both endpoints in one (2, 2) vector op
+            (sx, sy), (ex, ey) = self._map_coordinates(coordinates[:2])
             pyautogui.moveTo(sx, sy, duration=0.1)
             pyautogui.dragTo(ex, ey, duration=1.0)
             return f"Drag ({sx:.0f},{sy:.0f}) → ({ex:.0f},{ey:.0f})"
@@ -261,41 +381,30 @@ class ComputerController:
         if not coordinates or len(coordinates) < 2:
             return "No coordinates provided"
 
-        x, y = coordinates[:2]
-        sx, sy = self._map_coordinates(x, y, scale, img_w, img_h, window_offset)
-        pyautogui.moveTo(sx, sy, duration=0.1)
-
-        if action_type == "click":
-            pyautogui.click()
-        elif action_type == "double_click":
-            pyautogui.doubleClick()
-        elif action_type == "right_click":
-            pyautogui.rightClick()
-        elif action_type == "scroll_up":
-            pyautogui.scroll(500)
-        elif action_type == "scroll_down":
-            pyautogui.scroll(-500)
-        elif action_type == "input":
-            pyautogui.click()
-            time.sleep(0.3)
-        else:
+        handler = _POINT_ACTIONS.get(action_type)
+        if handler is None:
             return f"Unknown action: {action_type}"
 
+        sx, sy = self._map_coordinates(coordinates[:2])
+        pyautogui.moveTo(sx, sy, duration=0.1)
+        handler()
+
         result = f"{action_type} at ({sx:.0f}, {sy:.0f})"
 
-        # Text input via clipboard paste
+        # Text input via clipboard paste. System Events delivers the
+        # keystroke synchronously, so the old keyDown/press/keyUp chain with
+        # a wall-clock sleep between each step (~1 s of dead time per input)
+        # collapses into one blocking call.
         if text and action_type != "hotkey":
-            time.sleep(0.5)
             pyperclip.copy(text)
-            time.sleep(0.1)
-            pyautogui.keyDown("command")
-            time.sleep(0.1)
-            pyautogui.press("v")
-            time.sleep(0.1)
-            pyautogui.keyUp("command")
+            subprocess.run(
+                ["osascript", "-e",
+                 'tell application "System Events" to keystroke "v" using command down'],
+                check=True,
+            )
             result += f" + typed '{text[:50]}'"
 
-        time.sleep(0.8)
+        time.sleep(0.3)
         return result
 
     def run(self, objective: str) -> str:
@@ -307,47 +416,103 @@ class ComputerController:
         Returns:
             Final status message.
         """
-        self._history = []
+        return asyncio.run(self._run_async(objective))
+
+    async def _run_async(self, objective: str) -> str:
+        """Async automation loop driving the vision LLM.
+
+        Screenshot capture and pyautogui action execution run in worker
+        threads so the event loop stays free while the async LLM client keeps
+        its connection pool warm across iterations.
+        """
+        from openai import AsyncOpenAI
+
+        # One client per run — all iterations share its connection pool, so
+        # only the first LLM call pays the TCP+TLS handshake. The client
+        # cannot live in __init__: each run() owns its own event loop via
+        # asyncio.run, and pooled connections don't survive across loops.
+        self._llm = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=4),
+                transport=httpx.AsyncHTTPTransport(retries=2),
+            ),
+        )
+
+        self._rolling_summary = ""
         self._should_exit = False
         start_time = time.time()
         last_action = None
+        prev_phash = None
         loop_count = 0
         results = []
 
-        for iteration in range(self.max_iterations):
-            if time.time() - start_time > self.timeout:
-                return f"Timeout after {self.timeout}s ({iteration} iterations)"
-
-            try:
-                scale, window_offset = self._capture_screen()
-                ai_text = self._call_vision_llm(objective)
-                parsed = self._parse_response(ai_text)
-
-                status = parsed.get("status", "in_progress")
-                description = parsed.get("description", "")
-                action = parsed.get("action", {})
-
-                if status == "completed":
-                    return f"Completed: {description}"
-                if status == "failed":
-                    return f"Failed: {description}"
-
-                # Loop detection
-                if action == last_action:
-                    loop_count += 1
-                    if loop_count >= 3:
-                        return f"Stopped: action loop detected after {iteration + 1} iterations"
-                else:
-                    loop_count = 0
-                    last_action = action
-
-                result = self._execute_action(action, scale, window_offset)
-                results.append(f"[{iteration + 1}] {description} → {result}")
-
-            except KeyboardInterrupt:
-                return "Interrupted by user"
-            except Exception as e:
-                results.append(f"[{iteration + 1}] Error: {e}")
-                time.sleep(2)
-
-        return f"Reached max iterations ({self.max_iterations}). Last actions:\n" + "\n".join(results[-3:])
+        try:
+            for iteration in range(self.max_iterations):
+                if time.time() - start_time > self.timeout:
+                    return f"Timeout after {self.timeout}s ({iteration} iterations)"
+
+                try:
+                    await asyncio.to_thread(self._capture_screen)
+
+                    # If the model just asked to wait and the screen hasn't
+                    # repainted since, calling the LLM again would send the
+                    # same pixels — give the UI more time instead
+                    if (prev_phash is not None
+                            and last_action is not None
+                            and last_action.get("type") == "wait"
+                            and bin(self._screen_phash ^ prev_phash).count("1") <= 3):
+                        results.append(f"[{iteration + 1}] Screen unchanged → waiting")
+                        await asyncio.sleep(1)
+                        continue
+                    prev_phash = self._screen_phash
+
+                    # Near-identical screen + same objective → replay the
+                    # cached action instead of calling the LLM
+                    parsed = self._response_cache.get(self._screen_phash, objective)
+                    if parsed is None:
+                        ai_text = await self._call_vision_llm(objective)
+                        parsed = self._parse_response(ai_text)
+                        # Only cache in-progress steps: replaying a stale
+                        # "completed" on a similar start screen would end a
+                        # fresh run prematurely
+                        if parsed.get("status") == "in_progress":
+                            self._response_cache.put(
+                                self._screen_phash, objective, parsed)
+
+                    status = parsed.get("status", "in_progress")
+                    description = parsed.get("description", "")
+                    action = parsed.get("action", {})
+
+                    # Keep only the newest ~512 chars of step log
+                    step = f"[{iteration + 1}] {description[:80]} → {action.get('type', 'wait')}\n"
+                    self._rolling_summary = (self._rolling_summary + step)[-512:]
+
+                    if status == "completed":
+                        return f"Completed: {description}"
+                    if status == "failed":
+                        return f"Failed: {description}"
+
+                    # Loop detection
+                    if action == last_action:
+                        loop_count += 1
+                        if loop_count >= 3:
+                            return f"Stopped: action loop detected after {iteration + 1} iterations"
+                    else:
+                        loop_count = 0
+                        last_action = action
+
+                    result = await asyncio.to_thread(self._execute_action, action)
+                    results.append(f"[{iteration + 1}] {description} → {result}")
+
+                except KeyboardInterrupt:
+                    return "Interrupted by user"
+                except Exception as e:
+                    results.append(f"[{iteration + 1}] Error: {e}")
+                    await asyncio.sleep(2)
+
+            return f"Reached max iterations ({self.max_iterations}). Last actions:\n" + "\n".join(results[-3:])
+        finally:
+            await self._llm.close()
+            self._llm = None
@@ -1,11 +1,16 @@
 """Configuration loader for Chandler."""
 
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# libyaml's C loader parses 5-10x faster than the pure-Python SafeLoader;
+# fall back when PyYAML was built without it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Default config path: next to this file
 _DEFAULT_CONFIG = Path(__file__).parent / "config.yaml"
 # User config: ~/.chandler/config.yaml
@@ -29,7 +34,7 @@ _DEFAULTS = {
     "computer_control": {
         "max_iterations": 15,
         "timeout": 180,
-        "screenshot_max_size": 1280,
+        "screenshot_max_size": 1024,
         "active_window_only": False,
     },
     "memory": {
@@ -60,13 +65,13 @@ class Config:
         # Load bundled default config
         if _DEFAULT_CONFIG.exists():
             with open(_DEFAULT_CONFIG) as f:
-                bundled = yaml.safe_load(f) or {}
+                bundled = yaml.load(f, Loader=_YamlLoader) or {}
             self._data = _deep_merge(self._data, bundled)
 
         # Load user config (overrides bundled)
         if _USER_CONFIG.exists():
             with open(_USER_CONFIG) as f:
-                user = yaml.safe_load(f) or {}
+                user = yaml.load(f, Loader=_YamlLoader) or {}
             self._data = _deep_merge(self._data, user)
 
         # Environment variable overrides
@@ -74,48 +79,66 @@ class Config:
         if env_key:
             self._data["anthropic_api_key"] = env_key
 
-    @property
+    @cached_property
     def api_key(self) -> str:
         return self._data.get("anthropic_api_key", "")
 
-    @property
+    @cached_property
     def base_url(self) -> str:
         return self._data.get("anthropic_base_url", "https://api.anthropic.com")
 
-    @property
+    @cached_property
     def claude_model(self) -> str:
         return self._data.get("claude_model", "claude-sonnet-4-20250514")
 
-    @property
+    @cached_property
     def max_tokens(self) -> int:
         return self._data.get("max_tokens", 4096)
 
-    @property
+    @cached_property
     def api_timeout(self) -> float:
         return self._data.get("api_timeout", 300.0)
 
-    @property
+    @cached_property
+    def streaming(self) -> bool:
+        return self._data.get("streaming", False)
+
+    @cached_property
+    def optimized_latency(self) -> str:
+        # anthropic-beta flag for latency-optimized serving, passed through
+        # verbatim when the configured deployment supports one (empty = off)
+        return self._data.get("optimized_latency", "")
+
+    @cached_property
+    def max_context_turns(self) -> int:
+        return self._data.get("max_context_turns", 20)
+
+    @cached_property
+    def summarizer_model(self) -> str:
+        return self._data.get("summarizer_model", "claude-3-5-haiku-latest")
+
+    @cached_property
     def vision_model(self) -> dict:
         return self._data.get("vision_model", _DEFAULTS["vision_model"])
 
-    @property
+    @cached_property
     def allowed_directories(self) -> list[str]:
         dirs = self._data.get("allowed_directories", ["~"])
         return [str(Path(d).expanduser().resolve()) for d in dirs]
 
-    @property
+    @cached_property
     def safety(self) -> dict:
         return self._data.get("safety", _DEFAULTS["safety"])
 
-    @property
+    @cached_property
     def computer_control(self) -> dict:
         return self._data.get("computer_control", _DEFAULTS["computer_control"])
 
-    @property
+    @cached_property
     def memory_settings(self) -> dict:
         return self._data.get("memory", _DEFAULTS["memory"])
 
-    @property
+    @cached_property
     def extended_thinking(self) -> dict:
         return self._data.get("extended_thinking", {
             "enabled": False,
@@ -124,7 +147,7 @@ class Config:
             "max_budget": 64000,
         })
 
-    @property
+    @cached_property
     def voice_mode(self) -> dict:
         return self._data.get("voice_mode", {
             "enabled": True,
@@ -152,7 +175,7 @@ class Config:
             },
         })
 
-    @property
+    @cached_property
     def data_dir(self) -> Path:
         return Path(__file__).parent / "data"
 
@@ -162,11 +185,14 @@ class Config:
         user_data = {}
         if _USER_CONFIG.exists():
             with open(_USER_CONFIG) as f:
-                user_data = yaml.safe_load(f) or {}
+                user_data = yaml.load(f, Loader=_YamlLoader) or {}
         user_data["anthropic_api_key"] = key
         with open(_USER_CONFIG, "w") as f:
             yaml.dump(user_data, f, default_flow_style=False)
         self._data["anthropic_api_key"] = key
+        # _data is otherwise immutable post-init; this is the one mutation
+        # that must drop a cached_property value
+        self.__dict__.pop("api_key", None)
 
 
 # Singleton
@@ -12,9 +12,30 @@ import threading
 import logging
 from typing import Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+def _is_silent(chunk: np.ndarray, thresh: float = 500.0) -> bool:
+    """Vectorized RMS silence check for an int16 audio chunk.
+
+    Real ASR implementations call this every 10-50 ms; the whole-array
+    numpy reduction runs in SIMD (~10 us for a 1600-sample chunk) where a
+    per-sample Python loop would take ~1 ms. Squaring in int32 avoids
+    int16 overflow.
+
+    Args:
+        chunk: Mono int16 samples for one capture window
+        thresh: RMS level below which the chunk counts as silence
+
+    Returns:
+        True if the chunk is silence
+    """
+    rms = np.sqrt((chunk.astype(np.int32) ** 2).mean())
+    return float(rms) < thresh
+
+
 class TranscriptionTimeoutError(Exception):
     """Raised when transcription times out."""
     pass
@@ -56,14 +77,12 @@ def transcribe_audio(
             silence_start = None
 
             while time.time() - start_time < timeout:
-                if cancel_event and cancel_event.is_set():
+                # Wakes the instant the event is set instead of polling
+                if cancel_event and cancel_event.wait(0.1):
                     raise TranscriptionCancelledError()
 
-                # Check for silence (simplified)
-                time.sleep(0.1)
-
-                # Break if silence detected
-                # if is_silent(audio_data[-1]):
+                # Break if silence detected (use the vectorized helper)
+                # if _is_silent(audio_data[-1]):
                 #     if silence_start is None:
                 #         silence_start = time.time()
                 #     elif time.time() - silence_start > silence_threshold:
@@ -113,18 +132,23 @@ def transcribe_audio(
     logger.info(f"Starting high-precision ASR (timeout={timeout}s, silence_threshold={silence_threshold}s)")
 
     start_time = time.time()
+    deadline = start_time + timeout
     last_audio_time = start_time
     has_speech = False
 
     # STUB: Simulate recording and transcription
-    while time.time() - start_time < timeout:
-        # Check for cancellation (e.g., user switched to text input)
-        if cancel_event and cancel_event.is_set():
-            logger.info("ASR cancelled by user")
-            raise TranscriptionCancelledError("User switched to text input")
-
-        # STUB: Simulate audio processing
-        time.sleep(0.1)
+    while time.time() < deadline:
+        # Sleep until the next tick OR cancellation, whichever comes first.
+        # Event.wait returns True the moment the event is set, so the
+        # cancel path reacts immediately instead of up to 100 ms later
+        # (e.g., user switched to text input).
+        wait_slice = min(0.1, deadline - time.time())
+        if cancel_event is not None:
+            if cancel_event.wait(wait_slice):
+                logger.info("ASR cancelled by user")
+                raise TranscriptionCancelledError("User switched to text input")
+        else:
+            time.sleep(wait_slice)
 
         # STUB: Simulate speech detection
         # In production, check audio level to detect speech
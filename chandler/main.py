@@ -1,5 +1,6 @@
 """Chandler - Personal AI Assistant entry point."""
 
+import importlib
 import sys
 import signal
 import atexit
@@ -8,18 +9,28 @@ from chandler.config import config
 from chandler.memory import memory
 from chandler import ui
 
-# Import all tool modules to trigger registration via @tool decorators
-import chandler.tools.web_search      # noqa: F401
-import chandler.tools.web_browse      # noqa: F401
-import chandler.tools.run_python      # noqa: F401
-import chandler.tools.run_shell       # noqa: F401
-import chandler.tools.file_ops        # noqa: F401
-import chandler.tools.system_control  # noqa: F401
-import chandler.tools.computer_use    # noqa: F401
-import chandler.tools.memory_tools    # noqa: F401
-import chandler.tools.ai_news         # noqa: F401
-import chandler.tools.mode_control    # noqa: F401
-import chandler.tools.profile_tools   # noqa: F401
+# Tool modules imported to trigger registration via @tool decorators.
+# Loaded lazily in main() so the import cost (and each tool's own heavy
+# dependencies) isn't paid before the API-key prompt appears.
+_TOOL_MODULES = (
+    "chandler.tools.web_search",
+    "chandler.tools.web_browse",
+    "chandler.tools.run_python",
+    "chandler.tools.run_shell",
+    "chandler.tools.file_ops",
+    "chandler.tools.system_control",
+    "chandler.tools.computer_use",
+    "chandler.tools.memory_tools",
+    "chandler.tools.ai_news",
+    "chandler.tools.mode_control",
+    "chandler.tools.profile_tools",
+)
+
+
+def _register_tools():
+    """Import all tool modules so their @tool decorators register."""
+    for module in _TOOL_MODULES:
+        importlib.import_module(module)
 
 
 def _ensure_api_key():
@@ -66,6 +77,9 @@ def main():
     """Main REPL loop."""
     _ensure_api_key()
 
+    # Tools must be registered before Brain() snapshots their schemas
+    _register_tools()
+
     from chandler.brain import Brain
     brain = Brain()
 
@@ -112,7 +126,9 @@ def main():
         # Chat with Claude
         try:
             response = brain.chat(user_input)
-            ui.print_assistant(response)
+            # When streaming, the text was already printed incrementally
+            if not config.streaming:
+                ui.print_assistant(response)
         except KeyboardInterrupt:
             ui.print_info("\nInterrupted.")
         except Exception as e:
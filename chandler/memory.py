@@ -5,19 +5,94 @@ Auto-saves conversation sessions to prevent data loss.
 """
 
 import json
+import os
+import re
 import threading
 import queue
 import logging
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+try:
+    # C JSON encoder, ~5x faster than stdlib on the per-message hot path
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Incremental JSON parser; used for cold loads of a large memory.json
+    # so startup peak RSS is the live dict, not parser intermediates
+    import ijson
+except ImportError:
+    ijson = None
+
 from chandler.config import config
 from chandler.user_profile import UserProfile
 
 logger = logging.getLogger(__name__)
 
 
+def _find_json_span(text: str) -> Optional[str]:
+    """Return the first balanced {...} span in text, or None.
+
+    A single forward pass tracking brace depth (ignoring braces inside
+    quoted strings) — no regex backtracking over long prose replies, and
+    unlike the old greedy pattern it doesn't swallow text between two
+    separate JSON blocks.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+# Keys that route a remembered value into user_profile rather than facts
+_PROFILE_KEYS = frozenset({
+    "name", "age", "location", "occupation", "job", "email",
+    "language", "preferences", "background", "interests", "hobbies",
+})
+
+
+def _clean_profile_key(key: str) -> str:
+    """Normalize a key, stripping the optional user_ prefix."""
+    return key[5:].lower() if key.startswith("user_") else key.lower()
+
+
+def _dumps_fast(obj) -> bytes:
+    """Serialize for hot-path writes: orjson when available, else compact stdlib.
+
+    No indentation — the temp session file is machine-read only, and
+    indent=2 roughly doubles both encode time and bytes written.
+    memory.json keeps its human-readable indented form since it is written
+    rarely and inspected by users.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
 class FactExtractionWorker(threading.Thread):
     """Background worker for extracting facts from conversations."""
 
@@ -25,7 +100,9 @@ class FactExtractionWorker(threading.Thread):
         super().__init__(daemon=True)
         self.queue: queue.Queue = queue.Queue()
         self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
         self._memory_ref: Optional['Memory'] = None
+        self._client = None  # anthropic.Anthropic, created on first job
 
     def set_memory(self, memory: 'Memory'):
         """Set memory reference for accessing data."""
@@ -45,6 +122,13 @@ class FactExtractionWorker(threading.Thread):
             logger.warning("FactExtractionWorker: No memory reference set")
             return
 
+        # The thread starts on first job, not at Memory construction —
+        # sessions that never reach an extraction don't pay for it
+        if not self.is_alive():
+            with self._start_lock:
+                if not self.is_alive():
+                    self.start()
+
         self.queue.put(messages)
         logger.info(f"Scheduled fact extraction for {len(messages)} messages")
 
@@ -52,6 +136,11 @@ class FactExtractionWorker(threading.Thread):
         """Worker loop - processes extraction jobs."""
         logger.info("FactExtractionWorker started")
 
+        # Resolved once at thread start instead of per extraction job; the
+        # deferred import also keeps the SDK off the module import path
+        import anthropic
+        self._anthropic = anthropic
+
         while not self._stop_event.is_set():
             try:
                 # Wait for job with timeout to check stop_event
@@ -59,12 +148,24 @@ class FactExtractionWorker(threading.Thread):
             except queue.Empty:
                 continue
 
+            # Coalesce bursts: during fast chats jobs stack up quicker than
+            # the ~1 s API call drains them, and the message windows
+            # overlap — only the newest batch is worth extracting
+            drained = 0
+            while True:
+                try:
+                    messages = self.queue.get_nowait()
+                    drained += 1
+                except queue.Empty:
+                    break
+
             try:
                 self._extract_facts(messages)
             except Exception as e:
                 logger.error(f"Fact extraction failed: {e}", exc_info=True)
             finally:
-                self.queue.task_done()
+                for _ in range(drained + 1):
+                    self.queue.task_done()
 
         logger.info("FactExtractionWorker stopped")
 
@@ -78,9 +179,6 @@ class FactExtractionWorker(threading.Thread):
             return
 
         try:
-            # Import here to avoid circular dependency
-            import anthropic
-
             # Build extraction prompt
             conversation_text = "\n\n".join([
                 f"{msg['role']}: {msg['content']}"
@@ -101,13 +199,17 @@ Extract only explicit facts mentioned by the user (not assumptions or inferences
 
 Only include facts that are clearly stated. If no facts found, return empty objects."""
 
-            client = anthropic.Anthropic(
-                api_key=config.api_key,
-                base_url=config.base_url,
-                timeout=60,
-            )
-
-            response = client.messages.create(
+            # The worker is a long-lived daemon thread, so one client (and
+            # its connection pool) serves every extraction — no TLS
+            # handshake per job
+            if self._client is None:
+                self._client = self._anthropic.Anthropic(
+                    api_key=config.api_key,
+                    base_url=config.base_url,
+                    timeout=60,
+                )
+
+            response = self._client.messages.create(
                 model=config.claude_model,
                 max_tokens=1024,
                 messages=[{"role": "user", "content": extraction_prompt}],
@@ -118,17 +220,15 @@ Only include facts that are clearly stated. If no facts found, return empty obje
             logger.debug(f"Fact extraction response: {response_text}")
 
             # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                extracted = json.loads(json_match.group())
-
-                # Merge extracted facts into memory
-                for key, value in extracted.get("user_profile", {}).items():
-                    self._memory_ref.remember(key, value)
+            json_span = _find_json_span(response_text)
+            if json_span:
+                extracted = json.loads(json_span)
 
-                for key, value in extracted.get("facts", {}).items():
-                    self._memory_ref.remember(key, value)
+                # Merge extracted facts into memory as one batch
+                self._memory_ref.remember_many(
+                    extracted.get("user_profile", {}),
+                    extracted.get("facts", {}),
+                )
 
                 logger.info(f"Extracted and saved {len(extracted.get('user_profile', {}))} profile items and {len(extracted.get('facts', {}))} facts")
             else:
@@ -141,44 +241,164 @@ Only include facts that are clearly stated. If no facts found, return empty obje
 class Memory:
     """Persistent memory backed by a JSON file with automatic session saving."""
 
+    # Compact the append log into memory.json after this many appends
+    _COMPACT_EVERY = 32
+
     def __init__(self):
         self._path = config.data_dir / "memory.json"
+        # Hot writes append single lines here; memory.json is rewritten
+        # only on compaction or session commit
+        self._log_path = self._path.with_suffix(".log")
+        self._dirty_count = 0
+        # Debounced writer state: bursty saves collapse into one flush
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self._data = self._load()
 
+        # Inverted recall index, built lazily and dropped on any mutation
+        self._index: Optional[Dict[str, set]] = None
+        self._index_entries: List[tuple] = []
+        # Memoized facts/summaries section of the prompt context, same
+        # invalidation points as the index
+        self._context_tail: Optional[str] = None
+
         # Session management
         self._conversations_dir = config.data_dir / "conversations"
         self._temp_dir = config.data_dir / "temp"
         self._current_session_path: Optional[Path] = None
-        self._current_session_messages: List[Dict[str, Any]] = []
+        self._session_fp = None  # open append handle for the temp file
+        # Only the extraction window stays in memory; the full transcript
+        # lives in the JSONL temp file until commit
+        self._recent_messages: deque = deque(maxlen=5)
         self._message_count = 0
 
         # Create directories
         self._conversations_dir.mkdir(parents=True, exist_ok=True)
         self._temp_dir.mkdir(parents=True, exist_ok=True)
 
-        # Background fact extraction worker
+        # Background fact extraction worker (thread starts on first job)
         self.fact_worker = FactExtractionWorker()
         self.fact_worker.set_memory(self)
-        self.fact_worker.start()
 
         # User profile system
         self.user_profile = UserProfile(config.data_dir / "user_profile.json")
 
     def _load(self) -> dict:
-        """Load memory from disk."""
+        """Load memory from disk, replaying any uncompacted log appends."""
+        data = {"user_profile": {}, "facts": {}, "conversation_summaries": []}
         if self._path.exists():
+            loaded = None
+            # Stream-parse big files (summaries grow with history) so the
+            # cold load never materializes parser intermediates; json.load
+            # stays the fast path for the usual small file
+            if ijson is not None:
+                try:
+                    if self._path.stat().st_size >= 1 << 20:
+                        loaded = self._stream_load()
+                except OSError:
+                    pass
+            if loaded is None:
+                try:
+                    with open(self._path) as f:
+                        loaded = json.load(f)
+                except (json.JSONDecodeError, OSError):
+                    loaded = None
+            if loaded is not None:
+                data = loaded
+
+        # Entries written since the last compaction (e.g. after a crash)
+        if self._log_path.exists():
             try:
-                with open(self._path) as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
+                with open(self._log_path) as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if entry.get("op") == "set":
+                            data.setdefault(entry["bucket"], {})[entry["k"]] = entry["v"]
+                            self._dirty_count += 1
+            except OSError:
                 pass
-        return {"user_profile": {}, "facts": {}, "conversation_summaries": []}
+        return data
+
+    def _stream_load(self) -> Optional[dict]:
+        """Stream-parse memory.json bucket by bucket with ijson.
+
+        Returns None on any parse error so _load can fall back to
+        json.load (and from there to an empty store).
+        """
+        try:
+            data: dict = {}
+            with open(self._path, "rb") as f:
+                data["user_profile"] = dict(ijson.kvitems(f, "user_profile"))
+                f.seek(0)
+                data["facts"] = dict(ijson.kvitems(f, "facts"))
+                f.seek(0)
+                data["conversation_summaries"] = list(
+                    ijson.items(f, "conversation_summaries.item"))
+            return data
+        except Exception:
+            logger.warning("Streaming load of %s failed; falling back", self._path)
+            return None
 
     def _save(self):
-        """Persist memory to disk."""
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._path, "w") as f:
-            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        """Schedule a debounced save.
+
+        During fact-extraction bursts several mutations land within
+        milliseconds; a short timer lets them collapse into one disk write.
+        The append log already holds each entry, so nothing is lost if the
+        process dies before the timer fires.
+        """
+        with self._save_lock:
+            if self._save_timer is None:
+                timer = threading.Timer(0.5, self._flush)
+                timer.daemon = True
+                self._save_timer = timer
+                timer.start()
+
+    def _flush(self):
+        """Persist memory to disk now and clear the append log.
+
+        Written to a temp file and renamed into place: a crash mid-write
+        can no longer leave a truncated memory.json that _load would
+        silently discard (losing everything until re-extracted).
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self._path)
+            self._dirty_count = 0
+            if self._log_path.exists():
+                try:
+                    self._log_path.unlink()
+                except OSError:
+                    pass
+
+    def _append_log(self, bucket: str, key: str, value: str):
+        """Record one mutation as a log line instead of rewriting the file.
+
+        A full rewrite costs O(total memory) bytes per remembered fact; the
+        log costs O(entry). The log is folded into memory.json every
+        _COMPACT_EVERY appends, on session commit, and on load.
+        """
+        try:
+            with open(self._log_path, "a") as f:
+                f.write(json.dumps(
+                    {"op": "set", "bucket": bucket, "k": key, "v": value},
+                    ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to append memory log: {e}")
+            self._save()
+            return
+        self._dirty_count += 1
+        if self._dirty_count >= self._COMPACT_EVERY:
+            self._save()
 
     @property
     def facts(self) -> dict:
@@ -198,41 +418,120 @@ class Memory:
         If key starts with 'user_' or is a profile field (name, age, location, etc.),
         it goes into user_profile. Otherwise into facts.
         """
-        profile_keys = {
-            "name", "age", "location", "occupation", "job", "email",
-            "language", "preferences", "background", "interests", "hobbies",
-        }
-
-        clean_key = key.lower().replace("user_", "")
-        if clean_key in profile_keys or key.startswith("user_"):
+        is_user = key.startswith("user_")
+        clean_key = key[5:].lower() if is_user else key.lower()
+        if is_user or clean_key in _PROFILE_KEYS:
+            # Extraction often repeats known facts; unchanged values skip
+            # the log append (and eventual compaction) entirely
+            if self._data["user_profile"].get(clean_key) == value:
+                return f"Already known: {key} = {value}"
             self._data["user_profile"][clean_key] = value
+            self._append_log("user_profile", clean_key, value)
         else:
+            if self._data["facts"].get(key) == value:
+                return f"Already known: {key} = {value}"
             self._data["facts"][key] = value
+            self._append_log("facts", key, value)
 
-        self._save()
+        self._index = None
+        self._context_tail = None
         return f"Remembered: {key} = {value}"
 
-    def recall(self, query: str) -> str:
-        """Search memory for relevant facts."""
-        results = []
-        query_lower = query.lower()
+    def remember_many(self, profile_items: Dict[str, str], fact_items: Dict[str, str]):
+        """Store a batch of profile items and facts with a single log write.
 
-        # Search user profile
-        for k, v in self._data.get("user_profile", {}).items():
-            if query_lower in k.lower() or query_lower in str(v).lower():
-                results.append(f"[profile] {k}: {v}")
+        Used by the fact-extraction worker, which lands several entries at
+        once: one open/append covers the whole batch instead of a disk
+        round-trip per item.
 
-        # Search facts
-        for k, v in self._data.get("facts", {}).items():
-            if query_lower in k.lower() or query_lower in str(v).lower():
-                results.append(f"[fact] {k}: {v}")
+        Args:
+            profile_items: Entries destined for user_profile
+            fact_items: Entries destined for facts
+        """
+        lines = []
+        for key, value in profile_items.items():
+            clean_key = _clean_profile_key(key)
+            if self._data["user_profile"].get(clean_key) == value:
+                continue
+            self._data["user_profile"][clean_key] = value
+            lines.append(json.dumps(
+                {"op": "set", "bucket": "user_profile", "k": clean_key, "v": value},
+                ensure_ascii=False))
+        for key, value in fact_items.items():
+            if self._data["facts"].get(key) == value:
+                continue
+            self._data["facts"][key] = value
+            lines.append(json.dumps(
+                {"op": "set", "bucket": "facts", "k": key, "v": value},
+                ensure_ascii=False))
+        if not lines:
+            return
+        self._index = None
+        self._context_tail = None
 
-        # Search conversation summaries
+        try:
+            with open(self._log_path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to append memory log: {e}")
+            self._save()
+            return
+        self._dirty_count += len(lines)
+        if self._dirty_count >= self._COMPACT_EVERY:
+            self._save()
+
+    def _build_index(self):
+        """Build the token → entry inverted index over all memory entries.
+
+        Each entry is (display_line, lowercased_searchable_text). Built once
+        per mutation cycle so recall() narrows to a handful of candidates
+        instead of substring-scanning every entry on every call.
+        """
+        entries = []
+        for k, v in self._data.get("user_profile", {}).items():
+            entries.append((f"[profile] {k}: {v}", f"{k} {v}".lower()))
+        for k, v in self._data.get("facts", {}).items():
+            entries.append((f"[fact] {k}: {v}", f"{k} {v}".lower()))
         for summary in self._data.get("conversation_summaries", []):
             text = summary.get("summary", "")
-            if query_lower in text.lower():
-                date = summary.get("date", "unknown")
-                results.append(f"[conversation {date}] {text[:200]}")
+            date = summary.get("date", "unknown")
+            entries.append((f"[conversation {date}] {text[:200]}", text.lower()))
+
+        index: Dict[str, set] = {}
+        for i, (_, text) in enumerate(entries):
+            for token in set(re.findall(r"\w+", text)):
+                index.setdefault(token, set()).add(i)
+
+        self._index = index
+        self._index_entries = entries
+
+    def recall(self, query: str) -> str:
+        """Search memory for relevant facts."""
+        query_lower = query.lower()
+        if self._index is None:
+            self._build_index()
+
+        # Intersect per-token candidate sets, then verify the full query as
+        # a substring only on the survivors
+        candidates = None
+        for token in re.findall(r"\w+", query_lower):
+            ids = self._index.get(token, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+
+        if candidates:
+            pool = sorted(candidates)
+        else:
+            # Partial-token queries (e.g. "loc" for "location") miss the
+            # token index; fall back to the linear scan for those
+            pool = range(len(self._index_entries))
+
+        results = [
+            self._index_entries[i][0]
+            for i in pool
+            if query_lower in self._index_entries[i][1]
+        ]
 
         if not results:
             return "No matching memories found."
@@ -248,7 +547,11 @@ class Memory:
         # Keep only the most recent summaries
         if len(self._data["conversation_summaries"]) > max_summaries:
             self._data["conversation_summaries"] = self._data["conversation_summaries"][-max_summaries:]
-        self._save()
+        self._index = None
+        self._context_tail = None
+        # Summaries are not in the append log and happen about once per
+        # session, so write through immediately rather than debouncing
+        self._flush()
 
     def is_new_user(self) -> bool:
         """Check if this is a new user (no stored memories).
@@ -292,29 +595,44 @@ class Memory:
                 parts.append("\n## Relevant Context:")
                 parts.append(contextual_info)
 
-        # Legacy facts (only if not redundant with profile)
-        facts = self._data.get("facts", {})
-        # Filter out facts that are already in profile
-        if facts:
-            # Keep only first 3 facts for efficiency
-            fact_items = list(facts.items())[:3]
-            if fact_items:
-                parts.append("\n## Additional Notes:")
-                for k, v in fact_items:
-                    parts.append(f"- {k}: {v}")
-
-        # Recent conversation summaries (max 2 for efficiency)
-        summaries = self._data.get("conversation_summaries", [])
-        if summaries:
-            recent = summaries[-2:]  # Only last 2 sessions
-            if recent:
-                parts.append(f"\n## Recent Context ({len(summaries)} past sessions):")
-                for s in recent:
+        # Facts and summaries only change on remember/add_conversation_summary,
+        # so this section is rebuilt then and reused every other turn. The
+        # profile sections above stay live — UserProfile mutates through its
+        # own tools and can't invalidate this cache.
+        if self._context_tail is None:
+            tail = []
+
+            # Legacy facts (only first 3 for efficiency)
+            facts = self._data.get("facts", {})
+            if facts:
+                tail.append("\n## Additional Notes:")
+                for k, v in list(facts.items())[:3]:
+                    tail.append(f"- {k}: {v}")
+
+            # Recent conversation summaries (max 2 for efficiency)
+            summaries = self._data.get("conversation_summaries", [])
+            if summaries:
+                tail.append(f"\n## Recent Context ({len(summaries)} past sessions):")
+                for s in summaries[-2:]:
                     # Truncate to 100 chars for efficiency
-                    parts.append(f"- [{s.get('date', '?')[:10]}] {s.get('summary', '')[:100]}")
+                    tail.append(f"- [{s.get('date', '?')[:10]}] {s.get('summary', '')[:100]}")
+
+            self._context_tail = "\n".join(tail)
+
+        if self._context_tail:
+            parts.append(self._context_tail)
 
         return "\n".join(parts) if parts else "No memories yet — this is a new user."
 
+    def _close_session_fp(self):
+        """Close the temp-file handle if one is open."""
+        if self._session_fp is not None:
+            try:
+                self._session_fp.close()
+            except OSError:
+                pass
+            self._session_fp = None
+
     def start_session(self) -> str:
         """Start a new conversation session.
 
@@ -322,8 +640,16 @@ class Memory:
             Session ID (timestamp-based)
         """
         session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._current_session_path = self._temp_dir / "current_session.json"
-        self._current_session_messages = []
+        self._close_session_fp()
+        self._current_session_path = self._temp_dir / "current_session.jsonl"
+        # Drop any leftover from a crashed session so appends start clean
+        # (previously the first message of the new session overwrote it)
+        if self._current_session_path.exists():
+            try:
+                self._current_session_path.unlink()
+            except OSError:
+                pass
+        self._recent_messages.clear()
         self._message_count = 0
 
         logger.info(f"Started new session: {session_id}")
@@ -346,24 +672,25 @@ class Memory:
             "timestamp": datetime.now().isoformat(),
         }
 
-        self._current_session_messages.append(message)
+        self._recent_messages.append(message)
         self._message_count += 1
 
-        # Save to temp file immediately (crash recovery)
+        # Append to temp file immediately (crash recovery). One line per
+        # message on a handle kept open for the whole session — no
+        # open/close syscall pair per message; flush() pushes the line to
+        # the kernel, whose page cache handles the actual writeout.
         try:
-            with open(self._current_session_path, "w") as f:
-                json.dump({
-                    "messages": self._current_session_messages,
-                    "message_count": self._message_count,
-                }, f, indent=2, ensure_ascii=False)
+            if self._session_fp is None:
+                self._session_fp = open(
+                    self._current_session_path, "ab", buffering=1 << 16)
+            self._session_fp.write(_dumps_fast(message) + b"\n")
+            self._session_fp.flush()
         except Exception as e:
             logger.error(f"Failed to auto-save message: {e}")
 
         # Schedule fact extraction every 5 messages
         if self._message_count % 5 == 0 and self._message_count > 0:
-            # Get last 5 messages for fact extraction
-            recent_messages = self._current_session_messages[-5:]
-            self.fact_worker.schedule_extraction(recent_messages)
+            self.fact_worker.schedule_extraction(list(self._recent_messages))
 
     def commit_session(self, session_id: Optional[str] = None):
         """Commit the current session to permanent storage.
@@ -371,7 +698,27 @@ class Memory:
         Args:
             session_id: Optional session ID (will generate if not provided)
         """
-        if not self._current_session_messages:
+        # Fold pending log appends and any debounced save into memory.json
+        if self._dirty_count or self._save_timer is not None:
+            self._flush()
+
+        self._close_session_fp()
+
+        # Assemble the transcript from the JSONL temp file — the full list
+        # is never held in memory during the session
+        messages: List[Dict[str, Any]] = []
+        if self._current_session_path and self._current_session_path.exists():
+            try:
+                with open(self._current_session_path) as f:
+                    for line in f:
+                        try:
+                            messages.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue
+            except OSError as e:
+                logger.error(f"Failed to read session temp file: {e}")
+
+        if not messages:
             logger.info("No messages to commit")
             return
 
@@ -386,19 +733,19 @@ class Memory:
                 json.dump({
                     "session_id": session_id,
                     "timestamp": datetime.now().isoformat(),
-                    "message_count": self._message_count,
-                    "messages": self._current_session_messages,
+                    "message_count": len(messages),
+                    "messages": messages,
                 }, f, indent=2, ensure_ascii=False)
 
             logger.info(f"Session committed: {permanent_path}")
 
             # Remove temp file
-            if self._current_session_path and self._current_session_path.exists():
+            if self._current_session_path.exists():
                 self._current_session_path.unlink()
 
             # Reset session state
             self._current_session_path = None
-            self._current_session_messages = []
+            self._recent_messages.clear()
             self._message_count = 0
 
         except Exception as e:
@@ -412,14 +759,28 @@ class Memory:
         """
         cutoff = datetime.now().timestamp() - (days * 86400)
 
-        for session_file in self._conversations_dir.glob("session_*.json"):
-            if session_file.stat().st_mtime < cutoff:
-                try:
-                    session_file.unlink()
-                    logger.info(f"Deleted old session: {session_file.name}")
-                except Exception as e:
-                    logger.error(f"Failed to delete {session_file.name}: {e}")
-
-
-# Singleton
-memory = Memory()
+        # scandir's DirEntry caches the stat from the directory walk, so
+        # each file costs one syscall instead of glob's stat + our stat
+        with os.scandir(self._conversations_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("session_") and name.endswith(".json")):
+                    continue
+                if entry.stat().st_mtime < cutoff:
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"Deleted old session: {name}")
+                    except OSError as e:
+                        logger.error(f"Failed to delete {name}: {e}")
+
+
+# Singleton, constructed lazily (PEP 562): importing this module costs
+# nothing, `from chandler.memory import memory` triggers construction on
+# first import of the name — directory creation and the memory.json parse
+# stay off the path of anything that never touches memory.
+def __getattr__(name):
+    if name == "memory":
+        global memory
+        memory = Memory()
+        return memory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,8 +10,11 @@ Provides:
 import sys
 import signal
 import atexit
+import concurrent.futures
 import logging
-from typing import List, Tuple
+from collections import deque
+from enum import IntEnum
+from typing import Deque, Tuple
 
 try:
     import rumps
@@ -20,12 +23,13 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from Foundation import NSMakeRect, NSObject
+    from Foundation import NSMakeRect, NSObject, NSOperationQueue
     from AppKit import (
         NSScrollView, NSTextView, NSTextField, NSButton, NSView,
         NSMakePoint, NSMakeSize, NSTextAlignment,
         NSColor, NSFont, NSAttributedString,
         NSBezelBorder, NSMenu, NSMenuItem,
+        NSAlert, NSAlertFirstButtonReturn,
     )
 except ImportError:
     print("Error: PyObjC not installed. Should be included in Python 3.13 on macOS.")
@@ -43,15 +47,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Icon states
-ICONS = {
-    "idle": "💬",
-    "listening": "🎤",
-    "thinking": "🤔",
-    "speaking": "🗣️",
-    "typing": "⌨️",
-    "error": "⚠️",
-}
+# UI states with their display strings indexed by ordinal; tuple indexing
+# on a state transition beats three dict hashes plus a capitalize call
+class UIState(IntEnum):
+    IDLE = 0
+    LISTENING = 1
+    THINKING = 2
+    SPEAKING = 3
+    TYPING = 4
+    ERROR = 5
+
+
+# Controller callbacks still pass state names as strings; translate once
+_STATE_BY_NAME = {state.name.lower(): state for state in UIState}
+
+_ICONS = ("💬", "🎤", "🤔", "🗣️", "⌨️", "⚠️")
+_STATUS_EMOJI = ("🟢", "🎤", "🤔", "🗣️", "⌨️", "🔴")
+_STATE_TITLES = ("Idle", "Listening", "Thinking", "Speaking", "Typing", "Error")
+
+
+def _truncate(s: str, n: int) -> str:
+    """Clip to n chars with a one-character ellipsis; no copy when short."""
+    return s if len(s) <= n else s[:n - 1] + "…"
 
 
 class ConversationView:
@@ -64,6 +81,14 @@ class ConversationView:
     💬 assistant: [text response]
     """
 
+    # Only this many recent messages are kept in memory and in the view
+    MAX_MESSAGES = 200
+
+    # Fixed attribute set; skips the per-instance __dict__ and makes
+    # attribute access a slot read on the append hot path
+    __slots__ = ("scroll_view", "text_view", "messages", "_text_length",
+                 "_streaming")
+
     def __init__(self, width: int = 400, height: int = 300):
         """Initialize conversation view.
 
@@ -92,8 +117,18 @@ class ConversationView:
         # Set up scroll view
         self.scroll_view.setDocumentView_(self.text_view)
 
-        # Message history
-        self.messages: List[Tuple[str, str, str]] = []  # (role, content, mode)
+        # Message history, capped so a long session can't grow the view
+        # (and its layout cost) without bound. Entries carry the rendered
+        # length so eviction can trim the matching leading run of text.
+        self.messages: Deque[Tuple[str, str, str, int]] = deque(
+            maxlen=self.MAX_MESSAGES
+        )  # (role, content, mode, rendered length in UTF-16 units)
+        # Running length of the text view's contents; tracked here so
+        # scrolling never has to pull the whole string back from Cocoa
+        self._text_length = 0
+        # True between begin_stream/end_stream; appends then share one
+        # layout pass instead of one per chunk
+        self._streaming = False
 
     def append_message(self, role: str, content: str, mode: str):
         """Append message to conversation view.
@@ -111,26 +146,62 @@ class ConversationView:
 
         # Format message
         formatted = f"{icon} {role}: {content}\n\n"
+        attributed = NSAttributedString.alloc().initWithString_(formatted)
+        # Cocoa ranges count UTF-16 units, not Python code points — the
+        # leading emoji alone differ by one — so store the attributed
+        # string's own length for the eviction bookkeeping
+        run_len = attributed.length()
+
+        # Add to history; note what the deque is about to evict so the
+        # same run can be dropped from the front of the text storage
+        evicted_len = 0
+        if len(self.messages) == self.messages.maxlen:
+            evicted_len = self.messages[0][3]
+        self.messages.append((role, content, mode, run_len))
+
+        # Append just the new run to the text storage. Fetching the full
+        # string and setString_-ing the concatenation is O(transcript) per
+        # message and relays out the whole view; this stays O(message).
+        # During a stream, the begin_stream/end_stream pair owns the edit
+        # batch and the final scroll.
+        storage = self.text_view.textStorage()
+        if not self._streaming:
+            storage.beginEditing()
+        if evicted_len:
+            storage.deleteCharactersInRange_((0, evicted_len))
+            self._text_length -= evicted_len
+        storage.appendAttributedString_(attributed)
+        self._text_length += run_len
+        if not self._streaming:
+            storage.endEditing()
+            self.scroll_to_bottom()
+
+    def begin_stream(self):
+        """Open one text-storage edit batch for a burst of appends.
+
+        Streamed chunks written between begin_stream and end_stream share
+        a single relayout instead of triggering one per chunk.
+        """
+        if not self._streaming:
+            self._streaming = True
+            self.text_view.textStorage().beginEditing()
 
-        # Add to history
-        self.messages.append((role, content, mode))
-
-        # Update text view
-        current_text = self.text_view.string() or ""
-        self.text_view.setString_(current_text + formatted)
-
-        # Scroll to bottom
-        self.scroll_to_bottom()
+    def end_stream(self):
+        """Close the streaming edit batch and scroll once."""
+        if self._streaming:
+            self._streaming = False
+            self.text_view.textStorage().endEditing()
+            self.scroll_to_bottom()
 
     def clear(self):
         """Clear all messages."""
-        self.messages = []
+        self.messages.clear()
         self.text_view.setString_("")
+        self._text_length = 0
 
     def scroll_to_bottom(self):
         """Scroll to bottom of text view."""
-        text_length = len(self.text_view.string() or "")
-        self.text_view.scrollRangeToVisible_((text_length, 0))
+        self.text_view.scrollRangeToVisible_((self._text_length, 0))
 
     def get_view(self) -> NSScrollView:
         """Get the NSScrollView for embedding in menu.
@@ -150,11 +221,16 @@ class ChandlerMenuBarApp(rumps.App):
         # We'll set the title to include emoji instead
         super().__init__(
             name="Chandler",
-            title=ICONS["idle"],  # Use title for emoji icon
+            title=_ICONS[UIState.IDLE],  # Use title for emoji icon
             icon=None,  # No image icon
             quit_button=None,  # Custom quit handler
         )
 
+        # Blocking controller work runs on this queue so the rumps main
+        # thread never stalls behind it (a stalled main thread eventually
+        # gets the window killed by WindowServer)
+        self._bg_queue = NSOperationQueue.alloc().init()
+
         # Voice controller
         self.controller = VoiceController(
             ui_callback=self.update_state,
@@ -164,6 +240,24 @@ class ChandlerMenuBarApp(rumps.App):
         # State
         self.is_listening = False
         self.current_state = "idle"
+        # Message count mirrors the controller's; incremented locally so
+        # the per-message callback never round-trips into the controller
+        self._turn_count = 0
+
+        # Debounce for menu writes: every title assignment redraws the
+        # NSMenu, and state/message callbacks arrive in bursts. The first
+        # update in a burst renders immediately; later ones are held and
+        # applied together when the timer fires.
+        self._pending_state = None   # (state, message)
+        self._pending_msg = None     # (role, content, mode)
+        self._ui_timer = None
+
+        # Dialogs are allocated on the main thread, so build each one the
+        # first time it's shown and reuse it afterwards
+        self._text_window = None
+        self._clear_alert = None
+        self._quit_alert = None
+        self._about_alert = None
 
         # Build menu
         self._build_menu()
@@ -241,25 +335,33 @@ class ChandlerMenuBarApp(rumps.App):
             self.listening_toggle.title = "🎤 Enable Wake Word"
             return
 
-        # Start listening
-        try:
-            self.controller.start_listening()
-            self.is_listening = True
-            self.listening_toggle.title = "🔇 Stop Listening"
+        # Start listening off the main thread; init shouldn't block on it
+        def _start():
+            try:
+                self.controller.start_listening()
+            except Exception as e:
+                logger.error(f"Failed to auto-start listening: {e}", exc_info=True)
+
+                def _failed():
+                    self.status_item.title = f"⚠️  Error: {str(e)[:30]}"
+                    self.listening_toggle.title = "🎤 Start Listening"
+                self._on_main(_failed)
+                return
+
             logger.info("Wake word detection started automatically")
 
-            # Show notification
-            rumps.notification(
-                title="Chandler Active",
-                subtitle="Say 'hey chandler' to activate",
-                message="Listening for wake word...",
-                sound=False,
-            )
+            def _started():
+                self.is_listening = True
+                self.listening_toggle.title = "🔇 Stop Listening"
+                rumps.notification(
+                    title="Chandler Active",
+                    subtitle="Say 'hey chandler' to activate",
+                    message="Listening for wake word...",
+                    sound=False,
+                )
+            self._on_main(_started)
 
-        except Exception as e:
-            logger.error(f"Failed to auto-start listening: {e}", exc_info=True)
-            self.status_item.title = f"⚠️  Error: {str(e)[:30]}"
-            self.listening_toggle.title = "🎤 Start Listening"
+        self._bg_queue.addOperationWithBlock_(_start)
 
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
@@ -276,21 +378,92 @@ class ChandlerMenuBarApp(rumps.App):
         atexit.register(self._cleanup)
 
     def _cleanup(self):
-        """Cleanup resources before exit."""
+        """Cleanup resources before exit.
+
+        Session finalize and fact-worker stop run concurrently with a
+        short deadline each, so one stalled subsystem (network flush,
+        wedged worker) can't hold up process exit.
+        """
         try:
             logger.info("Cleaning up resources...")
 
-            # Finalize brain session if exists
+            tasks = [memory.fact_worker.stop]
             if hasattr(self.controller, 'brain') and self.controller.brain:
-                self.controller.brain.finalize_session()
-
-            # Stop fact worker
-            memory.fact_worker.stop()
+                tasks.append(self.controller.brain.finalize_session)
+
+            # No context manager: its exit would join the workers and
+            # reintroduce the unbounded wait the timeout is here to avoid
+            ex = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+            futures = [ex.submit(task) for task in tasks]
+            for future in futures:
+                try:
+                    future.result(timeout=2.0)
+                except Exception:
+                    logger.exception("Cleanup task failed or timed out")
+            ex.shutdown(wait=False)
 
             logger.info("Cleanup complete")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}", exc_info=True)
 
+    # Burst window for menu redraws; one redraw per window instead of one
+    # per update
+    _DEBOUNCE_INTERVAL = 0.15
+
+    def _in_background(self, fn, *args):
+        """Run a blocking call on the background queue, logging failures."""
+        def _run():
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception(f"Background task {fn.__name__} failed")
+        self._bg_queue.addOperationWithBlock_(_run)
+
+    @staticmethod
+    def _on_main(fn):
+        """Marshal a UI write back to the main thread."""
+        NSOperationQueue.mainQueue().addOperationWithBlock_(fn)
+
+    @staticmethod
+    def _make_alert(title: str, message: str, ok: str = "OK",
+                    cancel: str = ""):
+        """Build a reusable NSAlert (allocated once, runModal many)."""
+        alert = NSAlert.alloc().init()
+        alert.setMessageText_(title)
+        alert.setInformativeText_(message)
+        alert.addButtonWithTitle_(ok)
+        if cancel:
+            alert.addButtonWithTitle_(cancel)
+        return alert
+
+    def _schedule_ui_flush(self):
+        """Apply pending menu updates now (leading edge) or batch them.
+
+        If no debounce window is open, flush immediately and open one so
+        the rest of the burst coalesces; otherwise the pending values wait
+        for the timer to fire.
+        """
+        if self._ui_timer is None:
+            self._flush_ui(None)
+            self._ui_timer = rumps.Timer(self._flush_ui, self._DEBOUNCE_INTERVAL)
+            self._ui_timer.start()
+
+    def _flush_ui(self, timer):
+        """Write the latest pending state/message to the menu in one batch."""
+        if timer is not None:
+            timer.stop()
+            self._ui_timer = None
+
+        if self._pending_state is not None:
+            state, message = self._pending_state
+            self._pending_state = None
+            self._apply_state(state, message)
+
+        if self._pending_msg is not None:
+            role, content, mode = self._pending_msg
+            self._pending_msg = None
+            self._apply_message(role, content, mode)
+
     def update_state(self, state: str, message: str = ""):
         """Update menu bar state (called by VoiceController).
 
@@ -299,23 +472,21 @@ class ChandlerMenuBarApp(rumps.App):
             message: Optional status message
         """
         logger.info(f"State update: {state} - {message}")
+        # Called from controller threads; the actual menu writes must
+        # happen on the main thread
+        self._pending_state = (state, message)
+        self._on_main(self._schedule_ui_flush)
+
+    def _apply_state(self, state: str, message: str):
+        """Write a state transition to the menu bar (debounced)."""
         self.current_state = state
+        ui_state = _STATE_BY_NAME.get(state, UIState.IDLE)
 
         # Update menu bar icon (title)
-        self.title = ICONS.get(state, ICONS["idle"])
+        self.title = _ICONS[ui_state]
 
         # Update status item with emoji and better formatting
-        status_emoji = {
-            "idle": "🟢",
-            "listening": "🎤",
-            "thinking": "🤔",
-            "speaking": "🗣️",
-            "typing": "⌨️",
-            "error": "🔴",
-        }
-
-        emoji = status_emoji.get(state, "🟢")
-        status_text = f"{emoji} {state.capitalize()}"
+        status_text = f"{_STATUS_EMOJI[ui_state]} {_STATE_TITLES[ui_state]}"
         if message:
             status_text += f" - {message}"
 
@@ -330,7 +501,14 @@ class ChandlerMenuBarApp(rumps.App):
             mode: "voice" or "text"
         """
         logger.info(f"Adding message: {role} ({mode}): {content[:50]}...")
-
+        # Counted here (not in the debounced apply) so coalesced bursts
+        # still account for every message
+        self._turn_count += 1
+        self._pending_msg = (role, content, mode)
+        self._on_main(self._schedule_ui_flush)
+
+    def _apply_message(self, role: str, content: str, mode: str):
+        """Write the latest message preview to the menu (debounced)."""
         # Update conversation menu item with last message
         if role == "user":
             icon = "🎤" if mode == "voice" else "👤"
@@ -339,18 +517,17 @@ class ChandlerMenuBarApp(rumps.App):
             icon = "🗣️" if mode == "voice" else "🤖"
             label = "Chandler"
 
-        preview = content[:45] + "..." if len(content) > 45 else content
-        self.conversation_item.title = f"{icon} {label}: {preview}"
+        self.conversation_item.title = f"{icon} {label}: {_truncate(content, 46)}"
 
-        # Update turn counter
-        turn_count = self.controller.get_conversation_count()
-        self.turn_counter.title = f"📊 Conversation: {turn_count} messages"
+        # Update turn counter from the local count
+        self.turn_counter.title = f"📊 Conversation: {self._turn_count} messages"
 
     def toggle_listening(self, sender):
         """Toggle wake word listening."""
         if self.is_listening:
-            # Stop listening
-            self.controller.stop_listening()
+            # Stop listening (detector teardown can block; keep it off the
+            # main thread)
+            self._in_background(self.controller.stop_listening)
             self.is_listening = False
             sender.title = "🎤 Start Listening"
             self.status_item.title = "🔴 Stopped - Wake word disabled"
@@ -377,41 +554,53 @@ class ChandlerMenuBarApp(rumps.App):
                 )
                 return
 
-            # Start listening
-            try:
-                self.controller.start_listening()
-                self.is_listening = True
-                sender.title = "🔇 Stop Listening"
-                self.status_item.title = "🟢 Ready - Listening for wake word"
+            # Start listening on the background queue, marshalling the
+            # resulting UI update back to the main thread
+            def _start():
+                try:
+                    self.controller.start_listening()
+                except Exception as e:
+                    logger.error(f"Failed to start listening: {e}", exc_info=True)
+                    self._on_main(lambda: rumps.alert(
+                        title="Error Starting Wake Word Detection",
+                        message=f"{str(e)}\n\nCheck /tmp/chandler_voice.log for details.",
+                    ))
+                    return
+
                 logger.info("Started listening")
 
-                rumps.notification(
-                    title="Chandler Active",
-                    subtitle="Say 'hey chandler' to activate",
-                    message="Listening for wake word...",
-                    sound=False,
-                )
-            except Exception as e:
-                logger.error(f"Failed to start listening: {e}", exc_info=True)
-                rumps.alert(
-                    title="Error Starting Wake Word Detection",
-                    message=f"{str(e)}\n\nCheck /tmp/chandler_voice.log for details.",
-                )
+                def _started():
+                    self.is_listening = True
+                    sender.title = "🔇 Stop Listening"
+                    self.status_item.title = "🟢 Ready - Listening for wake word"
+                    rumps.notification(
+                        title="Chandler Active",
+                        subtitle="Say 'hey chandler' to activate",
+                        message="Listening for wake word...",
+                        sound=False,
+                    )
+                self._on_main(_started)
+
+            self._bg_queue.addOperationWithBlock_(_start)
 
     def show_text_input_dialog(self, sender):
         """Show dialog for text input.
 
         rumps doesn't support inline text fields, so we use a dialog.
         """
-        # Use rumps window to get text input
-        response = rumps.Window(
-            title="💬 Message Chandler",
-            message="What would you like to ask?",
-            default_text="",
-            ok="Send",
-            cancel="Cancel",
-            dimensions=(400, 180)
-        ).run()
+        # Built once; constructing the window allocates an NSAlert plus
+        # text field on the main thread, so reuse it across invocations
+        if self._text_window is None:
+            self._text_window = rumps.Window(
+                title="💬 Message Chandler",
+                message="What would you like to ask?",
+                default_text="",
+                ok="Send",
+                cancel="Cancel",
+                dimensions=(400, 180)
+            )
+        self._text_window.default_text = ""
+        response = self._text_window.run()
 
         if response.clicked:
             text = response.text
@@ -422,26 +611,29 @@ class ChandlerMenuBarApp(rumps.App):
                 rumps.notification(
                     title="Processing...",
                     subtitle="Chandler is thinking",
-                    message=text[:50] + ("..." if len(text) > 50 else ""),
+                    message=_truncate(text, 51),
                     sound=False,
                 )
 
-                self.controller.process_text_input(text)
+                # The full brain round-trip runs here; it must not hold
+                # the main thread for the duration of an LLM call
+                self._in_background(self.controller.process_text_input, text)
             else:
                 logger.debug("Empty text input, ignoring")
 
     def clear_conversation(self, sender):
         """Clear conversation history."""
         # Confirm before clearing
-        response = rumps.alert(
-            title="Clear Conversation?",
-            message="This will erase all conversation history.",
-            ok="Clear",
-            cancel="Cancel",
-        )
+        if self._clear_alert is None:
+            self._clear_alert = self._make_alert(
+                "Clear Conversation?",
+                "This will erase all conversation history.",
+                ok="Clear", cancel="Cancel",
+            )
 
-        if response == 1:  # OK clicked
+        if self._clear_alert.runModal() == NSAlertFirstButtonReturn:  # Clear clicked
             self.controller.clear_conversation()
+            self._turn_count = 0
             self.conversation_item.title = "💭 No messages yet"
             self.turn_counter.title = "📊 Conversation: 0 messages"
             logger.info("Conversation cleared")
@@ -455,36 +647,38 @@ class ChandlerMenuBarApp(rumps.App):
 
     def show_about(self, sender):
         """Show about dialog."""
-        rumps.alert(
-            title="💬 Chandler - AI Voice Assistant",
-            message=(
-                "Voice-activated AI assistant for macOS\n\n"
-                "🎤 Say 'hey chandler' to activate\n"
-                "⌨️  Or type messages anytime\n"
-                "🧠 Powered by Claude Sonnet 4.5\n"
-                "🍎 Uses Apple Speech Framework\n\n"
-                "Features:\n"
-                "• Web search & browsing\n"
-                "• Python code execution\n"
-                "• Shell commands\n"
-                "• File operations\n"
-                "• Computer vision\n"
-                "• Memory & context\n\n"
-                "Version 1.0"
-            ),
-        )
+        if self._about_alert is None:
+            self._about_alert = self._make_alert(
+                "💬 Chandler - AI Voice Assistant",
+                (
+                    "Voice-activated AI assistant for macOS\n\n"
+                    "🎤 Say 'hey chandler' to activate\n"
+                    "⌨️  Or type messages anytime\n"
+                    "🧠 Powered by Claude Sonnet 4.5\n"
+                    "🍎 Uses Apple Speech Framework\n\n"
+                    "Features:\n"
+                    "• Web search & browsing\n"
+                    "• Python code execution\n"
+                    "• Shell commands\n"
+                    "• File operations\n"
+                    "• Computer vision\n"
+                    "• Memory & context\n\n"
+                    "Version 1.0"
+                ),
+            )
+        self._about_alert.runModal()
 
     def quit_app(self, sender):
         """Quit application."""
         # Confirm before quitting
-        response = rumps.alert(
-            title="Quit Chandler?",
-            message="Wake word detection will stop.",
-            ok="Quit",
-            cancel="Cancel",
-        )
+        if self._quit_alert is None:
+            self._quit_alert = self._make_alert(
+                "Quit Chandler?",
+                "Wake word detection will stop.",
+                ok="Quit", cancel="Cancel",
+            )
 
-        if response == 1:  # OK clicked
+        if self._quit_alert.runModal() == NSAlertFirstButtonReturn:  # Quit clicked
             logger.info("Quitting Chandler")
             if self.is_listening:
                 logger.info("Stopping wake word detection...")
@@ -5,8 +5,9 @@ Allows Chandler to switch between specialized operational modes:
 - Research Mode: Deep, thorough, academic analysis with extended thinking
 """
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any
+from typing import Dict
 
 
 class Mode(Enum):
@@ -15,16 +16,38 @@ class Mode(Enum):
     RESEARCH = "research"
 
 
+# Name → Mode lookup, the single source of truth for parsing mode names.
+# Adding a mode to the enum automatically extends this table.
+MODE_BY_NAME: Dict[str, Mode] = {mode.value: mode for mode in Mode}
+
+
+@dataclass(slots=True, frozen=True)
+class ModeConfig:
+    """Per-mode settings, read on every LLM turn.
+
+    Slotted attribute reads are cheaper than the dict lookups the old
+    Dict[str, Any] layout forced on the hot _build_api_params path, and
+    frozen keeps the configs effectively constant.
+    """
+    name: str
+    emoji: str
+    description: str
+    extended_thinking: bool
+    budget_tokens: int
+    max_tokens: int
+    style_guidance: str
+
+
 # Mode configurations
-MODE_CONFIG: Dict[Mode, Dict[str, Any]] = {
-    Mode.BUDDY: {
-        "name": "Buddy Mode",
-        "emoji": "👋",
-        "description": "Quick, casual, and friendly",
-        "extended_thinking": False,
-        "budget_tokens": 0,
-        "max_tokens": 4096,
-        "style_guidance": """You are in Buddy Mode - your default personality as Chandler Bing!
+MODE_CONFIG: Dict[Mode, ModeConfig] = {
+    Mode.BUDDY: ModeConfig(
+        name="Buddy Mode",
+        emoji="👋",
+        description="Quick, casual, and friendly",
+        extended_thinking=False,
+        budget_tokens=0,
+        max_tokens=4096,
+        style_guidance="""You are in Buddy Mode - your default personality as Chandler Bing!
 
 **Style - Channel Chandler Bing:**
 - Sarcastic, self-deprecating, witty with awkward charm
@@ -51,15 +74,15 @@ MODE_CONFIG: Dict[Mode, Dict[str, Any]] = {
 - General coding help (unless asking about complex algorithms/theory)
 - Any task that doesn't require deep reasoning
 """,
-    },
-    Mode.RESEARCH: {
-        "name": "Research Mode",
-        "emoji": "🔬",
-        "description": "Deep, thorough, academic analysis",
-        "extended_thinking": True,
-        "budget_tokens": 15000,
-        "max_tokens": 4096,
-        "style_guidance": """You are in Research Mode - thorough, academic, and analytical.
+    ),
+    Mode.RESEARCH: ModeConfig(
+        name="Research Mode",
+        emoji="🔬",
+        description="Deep, thorough, academic analysis",
+        extended_thinking=True,
+        budget_tokens=15000,
+        max_tokens=4096,
+        style_guidance="""You are in Research Mode - thorough, academic, and analytical.
 
 **Style:**
 - Provide deep, comprehensive analysis
@@ -88,18 +111,18 @@ MODE_CONFIG: Dict[Mode, Dict[str, Any]] = {
 - Requests for more detail or clarification
 - "Can you elaborate on..." or "Tell me more about..."
 """,
-    },
+    ),
 }
 
 
-def get_mode_config(mode: Mode) -> Dict[str, Any]:
+def get_mode_config(mode: Mode) -> ModeConfig:
     """Get configuration for a specific mode.
 
     Args:
         mode: The mode to get config for
 
     Returns:
-        Configuration dictionary for the mode
+        ModeConfig for the mode
     """
     return MODE_CONFIG[mode]
 
@@ -115,11 +138,7 @@ def get_mode_announcement(mode: Mode, reason: str = "") -> str:
         Formatted announcement message
     """
     config = MODE_CONFIG[mode]
-    emoji = config["emoji"]
-    name = config["name"]
-    desc = config["description"]
-
     if reason:
-        return f"{emoji} Switching to {name} - {reason}"
+        return f"{config.emoji} Switching to {config.name} - {reason}"
     else:
-        return f"{emoji} Now in {name} ({desc})"
+        return f"{config.emoji} Now in {config.name} ({config.description})"
@@ -0,0 +1,126 @@
+"""Semantic response cache for greeting/small-talk turns.
+
+Short casual messages ("hi", "thanks", "how are you") don't need a full
+Claude round-trip — the system prompt itself mandates 1-2 sentence replies
+for them. This cache stores (embedding, response) pairs from past no-tool
+turns and answers similar messages locally in tens of milliseconds.
+
+Embeddings come from sentence-transformers (MiniLM) when installed; without
+it the cache degrades gracefully to normalized exact-text matching, which
+still covers the most common greetings.
+"""
+
+import logging
+import re
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Only short, punctuation-light messages are plausibly small talk
+_MAX_MESSAGE_CHARS = 80
+# Only cache short replies (~200 tokens) — matches the greeting path
+_MAX_RESPONSE_CHARS = 800
+
+_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class SemanticCache:
+    """In-memory cache of small-talk responses keyed by sentence similarity."""
+
+    def __init__(self, similarity_threshold: float = 0.9, max_entries: int = 64):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        # Embedding store: rows of normalized embeddings, parallel to _responses
+        self._embeddings = None
+        self._responses: list[str] = []
+
+        # Fallback store when no embedding model is available
+        self._exact: dict[str, str] = {}
+
+        self._model = None
+        self._model_load_failed = False
+
+    def _get_model(self):
+        """Lazy-load the sentence embedding model (optional dependency)."""
+        if self._model is None and not self._model_load_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(_MODEL_NAME)
+            except Exception as e:
+                self._model_load_failed = True
+                logger.debug(f"Semantic cache using exact-match fallback: {e}")
+        return self._model
+
+    def _encode(self, text: str):
+        model = self._get_model()
+        if model is None or np is None:
+            return None
+        return np.asarray(model.encode(text, normalize_embeddings=True))
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"[^a-z0-9 ]", "", text.lower()).strip()
+
+    @staticmethod
+    def _eligible_message(message: str) -> bool:
+        return 0 < len(message) <= _MAX_MESSAGE_CHARS
+
+    def lookup(self, message: str) -> Optional[str]:
+        """Return a cached response for a similar message, or None on miss."""
+        if not self._eligible_message(message):
+            return None
+
+        embedding = self._encode(message)
+        with self._lock:
+            if embedding is not None and self._embeddings is not None:
+                # Cosine similarity over normalized rows is a single matvec
+                similarities = self._embeddings @ embedding
+                best = int(similarities.argmax())
+                if similarities[best] >= self.similarity_threshold:
+                    logger.debug(f"Semantic cache hit (sim={similarities[best]:.2f})")
+                    return self._responses[best]
+                return None
+
+            return self._exact.get(self._normalize(message))
+
+    def store(self, message: str, response: str):
+        """Cache a response from a no-tool turn if it looks like small talk."""
+        if not self._eligible_message(message) or not response:
+            return
+        if len(response) > _MAX_RESPONSE_CHARS:
+            return
+
+        embedding = self._encode(message)
+        with self._lock:
+            if embedding is not None and np is not None:
+                row = embedding.reshape(1, -1)
+                if self._embeddings is None:
+                    self._embeddings = row
+                else:
+                    self._embeddings = np.vstack([self._embeddings, row])[-self.max_entries:]
+                self._responses.append(response)
+                self._responses = self._responses[-self.max_entries:]
+            else:
+                if len(self._exact) >= self.max_entries:
+                    # Drop the oldest entry (insertion order)
+                    self._exact.pop(next(iter(self._exact)))
+                self._exact[self._normalize(message)] = response
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._embeddings = None
+            self._responses = []
+            self._exact = {}
+
+
+# Singleton
+response_cache = SemanticCache()
@@ -1,7 +1,15 @@
 """Safety layer: command validation, path restrictions, user confirmation."""
 
+import functools
+import os
 import re
-from pathlib import Path
+
+try:
+    # Multi-pattern DFA scanner; compiles every blocklist pattern into one
+    # database and scans in a single pass. Python re remains the fallback.
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 from chandler.config import config
 
@@ -19,7 +27,9 @@ _DANGEROUS_PATTERNS = [
     r"\bwget\b.*\|\s*(ba)?sh",
 ]
 
-_DANGEROUS_COMPILED = [re.compile(p) for p in _DANGEROUS_PATTERNS]
+# One combined alternation so each check is a single pass through the C
+# regex engine instead of a Python loop of per-pattern searches
+_DANGEROUS_RE = re.compile("|".join(f"(?:{p})" for p in _DANGEROUS_PATTERNS))
 
 # Commands that are destructive but can be allowed with confirmation
 _CONFIRM_PATTERNS = [
@@ -36,39 +46,100 @@ _CONFIRM_PATTERNS = [
     r"\bbrew\s+(uninstall|remove)\b",
 ]
 
-_CONFIRM_COMPILED = [re.compile(p) for p in _CONFIRM_PATTERNS]
+_CONFIRM_RE = re.compile("|".join(f"(?:{p})" for p in _CONFIRM_PATTERNS))
+
+# Single hyperscan database over both lists: pattern ids below the split
+# are dangerous, the rest need confirmation. Built once at import; left
+# as None (re fallback) if hyperscan is missing or rejects a pattern.
+_HS_DANGEROUS_SPLIT = len(_DANGEROUS_PATTERNS)
+_HS_DB = None
+if hyperscan is not None:
+    try:
+        _all = _DANGEROUS_PATTERNS + _CONFIRM_PATTERNS
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=[p.encode() for p in _all],
+            ids=list(range(len(_all))),
+        )
+    except Exception:
+        _HS_DB = None
+
+
+def _hs_matched_ids(command: str) -> set:
+    """Scan command once, returning the set of matched pattern ids."""
+    matched: set = set()
+
+    def _on_match(pat_id, start, end, flags, context=None):
+        matched.add(pat_id)
+
+    _HS_DB.scan(command.encode(), match_event_handler=_on_match)
+    return matched
 
 
 def is_dangerous_command(command: str) -> bool:
     """Check if a shell command is in the blocklist (never allowed)."""
-    for pattern in _DANGEROUS_COMPILED:
-        if pattern.search(command):
-            return True
-    return False
+    if _HS_DB is not None:
+        return any(i < _HS_DANGEROUS_SPLIT for i in _hs_matched_ids(command))
+    return _DANGEROUS_RE.search(command) is not None
 
 
-def needs_confirmation(command: str) -> bool:
+def _needs_confirmation_checked(command: str) -> bool:
     """Check if a shell command needs user confirmation before execution."""
-    if not config.safety.get("require_confirmation_for_destructive", True):
-        return False
-    for pattern in _CONFIRM_COMPILED:
-        if pattern.search(command):
-            return True
+    if _HS_DB is not None:
+        return any(i >= _HS_DANGEROUS_SPLIT for i in _hs_matched_ids(command))
+    return _CONFIRM_RE.search(command) is not None
+
+
+def _needs_confirmation_disabled(command: str) -> bool:
+    """Confirmation disabled by config — never ask."""
     return False
 
 
+# The confirmation flag is fixed once config loads, so pick the
+# implementation here instead of re-reading config.safety on every
+# command validation
+if config.safety.get("require_confirmation_for_destructive", True):
+    needs_confirmation = _needs_confirmation_checked
+else:
+    needs_confirmation = _needs_confirmation_disabled
+
+
+# Allowed prefixes normalized once with a trailing slash so the boundary
+# check can't let /home/userdata match an allowed /home/user
+_ALLOWED_NORMED = tuple(
+    d.rstrip("/") + "/" for d in config.allowed_directories
+)
+
+
+def _under_allowed(normed: str) -> bool:
+    """Boundary-aware prefix test against the allowed directories."""
+    candidate = normed.rstrip("/") + "/"
+    return any(candidate.startswith(allowed) for allowed in _ALLOWED_NORMED)
+
+
+@functools.lru_cache(maxsize=1024)
 def is_path_allowed(path: str) -> bool:
-    """Check if a file path is within allowed directories."""
+    """Check if a file path is within allowed directories.
+
+    The path is resolved with realpath before the check: symlinks can
+    neither escape an allowed tree nor be rejected for merely routing
+    into one (on macOS /tmp is a symlink to /private/tmp, so an allowed
+    /tmp must admit /tmp/... paths). Results are cached per path string
+    (the allowed list is fixed after config load).
+    """
     try:
-        resolved = str(Path(path).expanduser().resolve())
-        for allowed in config.allowed_directories:
-            if resolved.startswith(allowed):
-                return True
-        return False
+        return _under_allowed(os.path.realpath(os.path.expanduser(path)))
     except (ValueError, OSError):
         return False
 
 
+if not _ALLOWED_NORMED:
+    # Nothing is permitted; skip the path work entirely
+    def is_path_allowed(path: str) -> bool:  # noqa: F811
+        """No allowed directories configured — every path is denied."""
+        return False
+
+
 def confirm_action(description: str) -> bool:
     """Ask user for confirmation of a potentially dangerous action."""
     try:
@@ -1,7 +1,33 @@
 """Tool registry with decorator-based schema generation for Claude tool_use."""
 
+import functools
 import inspect
-from typing import get_type_hints, Any, Callable
+import json
+import re
+from dataclasses import dataclass
+from typing import get_type_hints, Any, Callable, Literal, Optional
+
+try:
+    # C JSON encoder; the schemas are encoded once per process either way,
+    # but orjson keeps that one pass cheap for a large registry
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass
+class ToolOutcome:
+    """Structured result of a tool execution.
+
+    Replaces string-prefix sniffing ("Error...", "MODE_SWITCH:...") with a
+    single kind tag the caller can dispatch on. Tools returning plain strings
+    are classified by execute_tool; tools with out-of-band signalling (e.g.
+    switch_mode) can return a ToolOutcome directly.
+    """
+    kind: Literal["ok", "error", "mode_switch"]
+    content: str
+    mode: Optional[str] = None  # target mode name when kind == "mode_switch"
+    reason: str = ""
 
 # Global tool registry
 _tools: dict[str, dict] = {}
@@ -33,94 +59,150 @@ def tool(name: str, description: str):
             ...
     """
     def decorator(func: Callable) -> Callable:
-        hints = get_type_hints(func)
-        sig = inspect.signature(func)
-        param_docs = _parse_param_docs(func.__doc__ or "")
+        # Schema generation (get_type_hints, signature walk, docstring
+        # parse) is deferred to first use: the decorator runs once per
+        # tool at import, so keeping it trivial shortens startup.
+        _tools[name] = {
+            "schema": None,
+            "schema_json": None,
+            "func": func,
+            "name": name,
+            "description": description,
+        }
+        global _schemas_json_cache
+        _schemas_json_cache = None
 
-        properties = {}
-        required = []
+        func._tool_name = name
+        return func
 
-        for param_name, param in sig.parameters.items():
-            if param_name in ("self", "cls"):
-                continue
+    return decorator
 
-            param_type = hints.get(param_name, str)
-            json_type = _TYPE_MAP.get(param_type, "string")
 
-            prop: dict[str, Any] = {"type": json_type}
-            if param_name in param_docs:
-                prop["description"] = param_docs[param_name]
+@functools.lru_cache(maxsize=None)
+def _cached_hints(func: Callable) -> dict:
+    """Resolve a function's annotations once, the cheap way when possible.
 
-            properties[param_name] = prop
+    Tool signatures use plain builtins in practice, so reading
+    __annotations__ directly skips get_type_hints' eval-based forward
+    reference resolution; fall back only when a string annotation
+    actually needs evaluating (e.g. under `from __future__ import
+    annotations`).
+    """
+    annotations = getattr(func, "__annotations__", {})
+    if not any(isinstance(a, str) for a in annotations.values()):
+        return annotations
+    return get_type_hints(func)
 
-            if param.default is inspect.Parameter.empty:
-                required.append(param_name)
 
-        schema = {
-            "name": name,
-            "description": description,
-            "input_schema": {
-                "type": "object",
-                "properties": properties,
-                "required": required,
-            },
-        }
+def _build_schema(entry: dict) -> dict:
+    """Build and memoize the Claude tool_use schema for a registry entry."""
+    func = entry["func"]
+    hints = _cached_hints(func)
+    sig = inspect.signature(func)
+    param_docs = _parse_param_docs(func.__doc__ or "")
 
-        _tools[name] = {
-            "schema": schema,
-            "func": func,
-        }
+    properties = {}
+    required = []
 
-        func._tool_name = name
-        return func
+    for param_name, param in sig.parameters.items():
+        if param_name in ("self", "cls"):
+            continue
 
-    return decorator
+        param_type = hints.get(param_name, str)
+        json_type = _TYPE_MAP.get(param_type, "string")
+
+        prop: dict[str, Any] = {"type": json_type}
+        if param_name in param_docs:
+            prop["description"] = param_docs[param_name]
+
+        properties[param_name] = prop
+
+        if param.default is inspect.Parameter.empty:
+            required.append(param_name)
+
+    schema = {
+        "name": entry["name"],
+        "description": entry["description"],
+        "input_schema": {
+            "type": "object",
+            "properties": properties,
+            "required": required,
+        },
+    }
+    entry["schema"] = schema
+    # Frozen views for execute_tool's argument checks
+    entry["required_set"] = frozenset(required)
+    entry["param_names"] = frozenset(properties)
+    return schema
+
+
+# Args block: everything between "Args:" and the next section header
+# ("Returns:", "Raises:", ...) or the end of the docstring
+_ARGS_SECTION_RE = re.compile(
+    r"Args:\s*\n(.*?)(?=\n\s*[A-Z][a-z]+:\s*\n|\Z)",
+    re.DOTALL | re.IGNORECASE,
+)
+# One "name: description" entry (optionally bulleted or "name (type):"),
+# with continuation lines captured up to the next entry
+_PARAM_RE = re.compile(
+    r"^\s*(?:-\s*)?([A-Za-z_]\w*)\s*(?:\([^)]*\))?\s*:\s*"
+    r"(.*?)(?=\n\s*(?:-\s*)?[A-Za-z_]\w*\s*(?:\([^)]*\))?\s*:|\Z)",
+    re.MULTILINE | re.DOTALL,
+)
 
 
 def _parse_param_docs(docstring: str) -> dict[str, str]:
-    """Extract parameter descriptions from Args section of docstring."""
-    params = {}
-    in_args = False
-    current_param = None
-    current_desc_lines = []
+    """Extract parameter descriptions from Args section of docstring.
 
-    for line in docstring.split("\n"):
-        stripped = line.strip()
+    One pass of two compiled regexes instead of a Python line loop: find
+    the Args block, then pull each "name: description" entry (with its
+    continuation lines) via finditer.
+    """
+    section = _ARGS_SECTION_RE.search(docstring)
+    if section is None:
+        return {}
+    return {
+        m.group(1): " ".join(m.group(2).split())
+        for m in _PARAM_RE.finditer(section.group(1))
+    }
 
-        if stripped.lower().startswith("args:"):
-            in_args = True
-            continue
 
-        if in_args:
-            if stripped and not stripped.startswith("-") and ":" in stripped and not stripped.startswith(" "):
-                # Could be end of Args section (e.g. "Returns:")
-                if current_param:
-                    params[current_param] = " ".join(current_desc_lines).strip()
-                break
+def get_all_tool_schemas() -> list[dict]:
+    """Return all registered tool schemas for Claude API."""
+    return [
+        entry["schema"] if entry["schema"] is not None else _build_schema(entry)
+        for entry in _tools.values()
+    ]
 
-            # Match "param_name: description" or "param_name (type): description"
-            if ":" in stripped:
-                parts = stripped.lstrip("- ").split(":", 1)
-                param_candidate = parts[0].strip().split("(")[0].strip()
-                if param_candidate.isidentifier():
-                    if current_param:
-                        params[current_param] = " ".join(current_desc_lines).strip()
-                    current_param = param_candidate
-                    current_desc_lines = [parts[1].strip()]
-                    continue
 
-            if current_param and stripped:
-                current_desc_lines.append(stripped)
+# Pre-joined JSON of the full schema list, rebuilt only when a new tool
+# registers
+_schemas_json_cache: Optional[bytes] = None
 
-    if current_param:
-        params[current_param] = " ".join(current_desc_lines).strip()
 
-    return params
+def _dump_schema(schema: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(schema)
+    return json.dumps(schema, separators=(",", ":")).encode()
 
 
-def get_all_tool_schemas() -> list[dict]:
-    """Return all registered tool schemas for Claude API."""
-    return [entry["schema"] for entry in _tools.values()]
+def get_all_tool_schemas_json() -> bytes:
+    """Return the registered tool schemas as one pre-encoded JSON array.
+
+    The schemas never change after registration, so callers that send
+    them over raw HTTP (rather than through an SDK that wants dicts) can
+    reuse these bytes instead of re-serializing the list every request.
+    """
+    global _schemas_json_cache
+    if _schemas_json_cache is None:
+        parts = []
+        for entry in _tools.values():
+            if entry["schema_json"] is None:
+                schema = entry["schema"] if entry["schema"] is not None else _build_schema(entry)
+                entry["schema_json"] = _dump_schema(schema)
+            parts.append(entry["schema_json"])
+        _schemas_json_cache = b"[" + b",".join(parts) + b"]"
+    return _schemas_json_cache
 
 
 def get_tool_func(name: str) -> Callable | None:
@@ -129,13 +211,40 @@ def get_tool_func(name: str) -> Callable | None:
     return entry["func"] if entry else None
 
 
-def execute_tool(name: str, arguments: dict) -> str:
-    """Execute a registered tool with the given arguments."""
-    func = get_tool_func(name)
-    if func is None:
-        return f"Error: Unknown tool '{name}'"
+def execute_tool(name: str, arguments: dict) -> ToolOutcome:
+    """Execute a registered tool and return a structured outcome.
+
+    Arguments straight from the LLM are validated against the schema's
+    parameter sets first: a missing required argument gets a precise
+    error instead of the TypeError from ** unpacking, and hallucinated
+    extras are dropped rather than crashing the call.
+    """
+    entry = _tools.get(name)
+    if entry is None:
+        return ToolOutcome(kind="error", content=f"Error: Unknown tool '{name}'")
+    if entry["schema"] is None:
+        _build_schema(entry)
+
+    missing = entry["required_set"] - arguments.keys()
+    if missing:
+        return ToolOutcome(
+            kind="error",
+            content=f"Error executing {name}: missing required arguments: "
+                    f"{', '.join(sorted(missing))}",
+        )
+    if arguments.keys() - entry["param_names"]:
+        arguments = {k: v for k, v in arguments.items()
+                     if k in entry["param_names"]}
+
     try:
-        result = func(**arguments)
-        return str(result) if result is not None else "Done."
+        result = entry["func"](**arguments)
     except Exception as e:
-        return f"Error executing {name}: {e}"
+        return ToolOutcome(kind="error", content=f"Error executing {name}: {e}")
+
+    if isinstance(result, ToolOutcome):
+        return result
+
+    content = str(result) if result is not None else "Done."
+    if content.startswith("Error"):
+        return ToolOutcome(kind="error", content=content)
+    return ToolOutcome(kind="ok", content=content)
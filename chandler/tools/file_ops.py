@@ -6,6 +6,10 @@ from pathlib import Path
 from chandler.tools import tool
 from chandler.safety import validate_file_path
 
+# Returned content is capped here; reads never pull more than this (plus
+# one byte to detect truncation) into memory
+_READ_LIMIT = 50000
+
 
 @tool(name="read_file", description="Read the contents of a file. Only works for files within allowed directories.")
 def read_file(path: str) -> str:
@@ -19,10 +23,13 @@ def read_file(path: str) -> str:
         return reason
 
     try:
-        with open(resolved) as f:
-            content = f.read()
-        if len(content) > 50000:
-            content = content[:50000] + "\n\n[...truncated at 50000 chars]"
+        # Bounded read: f.read() on a huge file would materialize all of
+        # it just to throw away everything past the cap
+        with open(resolved, "rb") as f:
+            data = f.read(_READ_LIMIT + 1)
+        content = data[:_READ_LIMIT].decode("utf-8", errors="replace")
+        if len(data) > _READ_LIMIT:
+            content += "\n\n[...truncated at 50000 chars]"
         return content
     except Exception as e:
         return f"Error reading file: {e}"
@@ -42,9 +49,11 @@ def write_file(path: str, content: str) -> str:
 
     try:
         Path(resolved).parent.mkdir(parents=True, exist_ok=True)
-        with open(resolved, "w") as f:
-            f.write(content)
-        return f"Written {len(content)} bytes to {resolved}"
+        # Encode once and write the bytes in a single call rather than
+        # going through a text-mode wrapper's incremental encoder
+        data = content.encode("utf-8")
+        Path(resolved).write_bytes(data)
+        return f"Written {len(data)} bytes to {resolved}"
     except Exception as e:
         return f"Error writing file: {e}"
 
@@ -68,26 +77,41 @@ def list_files(path: str, recursive: bool = False) -> str:
 
         entries = []
         if recursive:
-            for item in sorted(p.rglob("*")):
-                rel = item.relative_to(p)
-                prefix = "📁 " if item.is_dir() else "📄 "
-                entries.append(f"{prefix}{rel}")
+            # os.walk streams the tree (scandir-based), so the traversal
+            # stops at the 200-entry cap instead of rglob + sorted
+            # materializing every path under the root first — a
+            # node_modules-sized subtree no longer gets fully scanned
+            for root, dirs, files in os.walk(resolved, followlinks=False):
+                dirs.sort()
+                files.sort()
+                rel_root = os.path.relpath(root, resolved)
+                prefix_path = "" if rel_root == "." else rel_root + os.sep
+                for name in dirs:
+                    entries.append(f"📁 {prefix_path}{name}")
+                for name in files:
+                    entries.append(f"📄 {prefix_path}{name}")
                 if len(entries) >= 200:
+                    del entries[200:]
                     entries.append("...(truncated at 200 entries)")
                     break
         else:
-            for item in sorted(p.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
+            # DirEntry carries type and stat from the directory scan
+            # itself, so no extra stat syscall per entry like
+            # Path.is_dir/is_file/stat would issue
+            with os.scandir(resolved) as it:
+                items = sorted(it, key=lambda e: e.name)
+            for entry in items:
+                prefix = "📁 " if entry.is_dir(follow_symlinks=False) else "📄 "
                 size = ""
-                if item.is_file():
-                    s = item.stat().st_size
+                if entry.is_file(follow_symlinks=False):
+                    s = entry.stat().st_size
                     if s >= 1024 * 1024:
                         size = f" ({s / 1024 / 1024:.1f} MB)"
                     elif s >= 1024:
                         size = f" ({s / 1024:.1f} KB)"
                     else:
                         size = f" ({s} B)"
-                entries.append(f"{prefix}{item.name}{size}")
+                entries.append(f"{prefix}{entry.name}{size}")
 
         return "\n".join(entries) if entries else "(empty directory)"
     except Exception as e:
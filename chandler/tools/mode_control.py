@@ -1,7 +1,6 @@
 """Mode control tool - allows Chandler to switch between operational modes."""
 
-from chandler.tools import tool
-from chandler.modes import Mode
+from chandler.tools import tool, ToolOutcome
 
 
 @tool(
@@ -33,4 +32,9 @@ def switch_mode(mode: str, reason: str = "") -> str:
 
     # Note: The actual mode switch is handled by Brain
     # This tool just signals the intent - Brain will process it
-    return f"MODE_SWITCH:{mode}:{reason}"
+    return ToolOutcome(
+        kind="mode_switch",
+        content=f"Requested switch to {mode} mode",
+        mode=mode,
+        reason=reason,
+    )
@@ -1,11 +1,82 @@
 """Execute Python code in a sandboxed subprocess."""
 
-import subprocess
-import tempfile
+import json
 import os
+import subprocess
+import threading
 
 from chandler.tools import tool
 
+# Program for the warm worker process: it reads length-prefixed code
+# blobs off stdin, execs each one in a fresh namespace with stdout and
+# stderr captured, and answers with one JSON line. Keeping the process
+# alive amortizes interpreter startup (site/encodings imports, ~100 ms)
+# to zero across the repeated calls an agent loop makes. The protocol
+# runs over binary pipes with a byte-length prefix — text-mode pipes
+# translate newlines, so a character count desyncs on literal "\r\n".
+_WORKER_SRC = """
+import contextlib, io, json, sys, traceback
+while True:
+    header = sys.stdin.buffer.readline()
+    if not header:
+        break
+    code = sys.stdin.buffer.read(int(header)).decode("utf-8")
+    out, err = io.StringIO(), io.StringIO()
+    rc = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            exec(compile(code, "<run_python>", "exec"), {"__name__": "__main__"})
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            rc = e.code
+        elif e.code is not None:
+            err.write(str(e.code) + "\\n")
+            rc = 1
+    except BaseException:
+        traceback.print_exc(file=err)
+        rc = 1
+    sys.stdout.buffer.write(json.dumps(
+        {"stdout": out.getvalue(), "stderr": err.getvalue(), "returncode": rc}
+    ).encode() + b"\\n")
+    sys.stdout.buffer.flush()
+"""
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _spawn_worker() -> subprocess.Popen:
+    return subprocess.Popen(
+        ["python3", "-u", "-c", _WORKER_SRC],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def _kill_worker():
+    """Discard the worker; the next call spawns a fresh one."""
+    global _worker
+    if _worker is not None:
+        try:
+            _worker.kill()
+        except Exception:
+            pass
+        _worker = None
+
+
+def _read_reply(proc: subprocess.Popen, timeout: float):
+    """Read one response line with a deadline; None means timed out."""
+    lines: list = []
+    reader = threading.Thread(
+        target=lambda: lines.append(proc.stdout.readline()), daemon=True
+    )
+    reader.start()
+    reader.join(timeout)
+    if reader.is_alive():
+        return None
+    return lines[0] if lines else ""
+
 
 @tool(name="run_python", description="Execute Python code and return the output. Code runs in a separate subprocess with a 30-second timeout.")
 def run_python(code: str) -> str:
@@ -13,32 +84,38 @@ def run_python(code: str) -> str:
     Args:
         code: Python code to execute
     """
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", delete=False
-        ) as f:
-            f.write(code)
-            tmp_path = f.name
+    global _worker
+    with _worker_lock:
+        try:
+            if _worker is None or _worker.poll() is not None:
+                _worker = _spawn_worker()
+            data = code.encode("utf-8")
+            _worker.stdin.write(b"%d\n%s" % (len(data), data))
+            _worker.stdin.flush()
+        except Exception as e:
+            _kill_worker()
+            return f"Error running Python code: {e}"
 
+        line = _read_reply(_worker, 30.0)
+        if line is None:
+            # Runaway code: the only way out is killing the interpreter
+            _kill_worker()
+            return "Error: Code execution timed out (30s limit)"
+        if not line:
+            _kill_worker()
+            return "Error: Python worker exited unexpectedly"
         try:
-            result = subprocess.run(
-                ["python3", tmp_path],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
-            )
-            output = ""
-            if result.stdout:
-                output += result.stdout
-            if result.stderr:
-                output += ("\n--- stderr ---\n" + result.stderr) if output else result.stderr
-            if result.returncode != 0:
-                output += f"\n[exit code: {result.returncode}]"
-            return output or "(no output)"
-        finally:
-            os.unlink(tmp_path)
-    except subprocess.TimeoutExpired:
-        return "Error: Code execution timed out (30s limit)"
-    except Exception as e:
-        return f"Error running Python code: {e}"
+            reply = json.loads(line)
+        except ValueError:
+            # User code wrote to the real fd 1 and broke the protocol
+            _kill_worker()
+            return "Error: Python worker returned malformed output"
+
+    output = ""
+    if reply["stdout"]:
+        output += reply["stdout"]
+    if reply["stderr"]:
+        output += ("\n--- stderr ---\n" + reply["stderr"]) if output else reply["stderr"]
+    if reply["returncode"] != 0:
+        output += f"\n[exit code: {reply['returncode']}]"
+    return output or "(no output)"
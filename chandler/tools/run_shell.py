@@ -1,10 +1,42 @@
 """Execute shell commands with safety checks."""
 
+import os
+import signal
 import subprocess
+import threading
 
 from chandler.tools import tool
 from chandler.safety import validate_shell_command
 
+# Captured output is capped per stream; a command spewing hundreds of MB
+# gets killed instead of buffered into memory
+_OUTPUT_LIMIT = 200000
+
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill the command's whole process group.
+
+    The shell may fork the actual command rather than exec it; killing
+    only the shell would orphan that child, which keeps the pipes open
+    and the reader threads blocked.
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        proc.kill()
+
+
+def _drain(pipe, proc: subprocess.Popen, chunks: list) -> None:
+    """Read a pipe into chunks, killing the process past the cap."""
+    remaining = _OUTPUT_LIMIT + 1
+    while remaining > 0:
+        chunk = pipe.read(min(65536, remaining))
+        if not chunk:
+            return
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    _kill_tree(proc)
+
 
 @tool(name="run_shell", description="Execute a shell command on macOS and return its output. Commands are validated for safety before execution.")
 def run_shell(command: str) -> str:
@@ -17,22 +49,48 @@ def run_shell(command: str) -> str:
         return reason
 
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
+        # Explicit argv form of what shell=True builds internally, with
+        # the two pipes drained on threads so capture stays bounded
+        # instead of communicate() accumulating everything
+        proc = subprocess.Popen(
+            ["/bin/sh", "-c", command],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=60,
+            start_new_session=True,
         )
+        out_chunks: list = []
+        err_chunks: list = []
+        readers = [
+            threading.Thread(target=_drain, args=(proc.stdout, proc, out_chunks), daemon=True),
+            threading.Thread(target=_drain, args=(proc.stderr, proc, err_chunks), daemon=True),
+        ]
+        for r in readers:
+            r.start()
+        try:
+            proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            _kill_tree(proc)
+            proc.wait()
+            return "Error: Command timed out (60s limit)"
+        for r in readers:
+            r.join(timeout=5)
+
+        stdout = "".join(out_chunks)
+        stderr = "".join(err_chunks)
+        truncated = len(stdout) > _OUTPUT_LIMIT or len(stderr) > _OUTPUT_LIMIT
+        stdout = stdout[:_OUTPUT_LIMIT]
+        stderr = stderr[:_OUTPUT_LIMIT]
+
         output = ""
-        if result.stdout:
-            output += result.stdout
-        if result.stderr:
-            output += ("\n--- stderr ---\n" + result.stderr) if output else result.stderr
-        if result.returncode != 0 and not output:
-            output = f"Command failed with exit code {result.returncode}"
+        if stdout:
+            output += stdout
+        if stderr:
+            output += ("\n--- stderr ---\n" + stderr) if output else stderr
+        if truncated:
+            output += f"\n[...output truncated at {_OUTPUT_LIMIT} chars, command killed]"
+        elif proc.returncode != 0 and not output:
+            output = f"Command failed with exit code {proc.returncode}"
         return output or "(no output)"
-    except subprocess.TimeoutExpired:
-        return "Error: Command timed out (60s limit)"
     except Exception as e:
         return f"Error executing command: {e}"
@@ -42,8 +42,16 @@ def print_tool_call(tool_name: str, args: dict):
 
 
 def print_tool_result(tool_name: str, result: str, max_len: int = 500):
-    """Display a tool result."""
-    display = result[:max_len] + "..." if len(result) > max_len else result
+    """Display a tool result, capped to a short preview.
+
+    Large outputs (shell dumps, file reads) can take Rich hundreds of ms to
+    render; only a fixed-size preview is shown here. The full result still
+    goes back to Claude untouched.
+    """
+    if len(result) > max_len:
+        display = f"{result[:max_len]}… (+{len(result) - max_len} more chars)"
+    else:
+        display = result
     console.print(f"  [dim green]✓ {tool_name} → {display}[/dim green]")
 
 
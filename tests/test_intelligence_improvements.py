@@ -28,27 +28,31 @@ import signal
 
 
 def test_datetime_injection():
-    """Test that datetime is injected into system prompt."""
+    """Test that datetime is injected into the system blocks."""
     print("\n1. Testing DateTime Injection...")
     try:
         from chandler.brain import Brain
         brain = Brain()
 
-        system_prompt = brain._build_system_prompt()
+        # The datetime lives in its own system block after the cacheable
+        # prompt, so inspect the API params rather than the static prompt
+        system_text = "\n".join(
+            block["text"] for block in brain._build_api_params()["system"]
+        )
 
         # Check if datetime section exists
-        if "## Current Date and Time" in system_prompt:
+        if "## Current Date and Time" in system_text:
             # Verify the format (YYYY-MM-DD HH:MM:SS)
             current_year = str(datetime.now().year)
-            if current_year in system_prompt:
+            if current_year in system_text:
                 print("   ✓ DateTime injection working correctly")
                 return True
             else:
                 print(f"   ✗ DateTime found but doesn't contain current year: {current_year}")
                 return False
         else:
-            print("   ✗ DateTime section not found in system prompt")
-            print(f"   System prompt preview: {system_prompt[:200]}...")
+            print("   ✗ DateTime section not found in system blocks")
+            print(f"   System preview: {system_text[:200]}...")
             return False
     except Exception as e:
         print(f"   ✗ Error: {e}")
@@ -123,8 +127,8 @@ def test_session_management():
         memory.auto_save_message("user", "Hello, this is a test message")
         memory.auto_save_message("assistant", "Hello! This is a test response.")
 
-        # Check temp file exists
-        temp_file = temp_dir / "current_session.json"
+        # Check temp file exists (JSONL: one message per appended line)
+        temp_file = temp_dir / "current_session.jsonl"
         if temp_file.exists():
             print(f"   ✓ Temp file created: {temp_file}")
         else:
@@ -134,12 +138,12 @@ def test_session_management():
         # Read temp file to verify
         import json
         with open(temp_file) as f:
-            temp_data = json.load(f)
+            saved = [json.loads(line) for line in f if line.strip()]
 
-        if temp_data["message_count"] == 2:
+        if len(saved) == 2 and saved[0]["role"] == "user":
             print(f"   ✓ Auto-save working (2 messages saved)")
         else:
-            print(f"   ✗ Message count mismatch: {temp_data['message_count']}")
+            print(f"   ✗ Message count mismatch: {len(saved)}")
             return False
 
         # Commit session
@@ -173,17 +177,27 @@ def test_session_management():
 
 
 def test_fact_extraction_worker():
-    """Test that background fact worker starts."""
+    """Test that background fact worker starts on first job."""
     print("\n4. Testing Background Fact Extraction Worker...")
     try:
         from chandler.memory import memory
 
-        # Check if worker thread is alive
+        # The worker thread starts lazily on the first scheduled job, not
+        # at Memory construction
         if memory.fact_worker.is_alive():
-            print("   ✓ Fact extraction worker is running")
+            print("   ✓ Fact extraction worker already running (job scheduled earlier)")
+            return True
+
+        memory.fact_worker.schedule_extraction([
+            {"role": "user", "content": "Test message for worker startup"},
+        ])
+        time.sleep(0.5)
+
+        if memory.fact_worker.is_alive():
+            print("   ✓ Fact extraction worker started on first job")
             return True
         else:
-            print("   ✗ Fact extraction worker is not running")
+            print("   ✗ Fact extraction worker did not start")
             return False
 
     except Exception as e:
@@ -259,11 +273,11 @@ def test_brain_api_params():
         else:
             print("   ✓ API params correct (extended thinking disabled)")
 
-        # Test that datetime is in system prompt
-        if "Current Date and Time" in params["system"]:
-            print("   ✓ DateTime present in system prompt")
+        # Test that datetime is in one of the system blocks
+        if any("Current Date and Time" in block["text"] for block in params["system"]):
+            print("   ✓ DateTime present in system blocks")
         else:
-            print("   ✗ DateTime not found in system prompt")
+            print("   ✗ DateTime not found in system blocks")
             return False
 
         return True
@@ -32,25 +32,25 @@ def test_modes_module():
         assert Mode.RESEARCH
         print("   ✓ Mode enums defined")
 
-        # Check configurations
+        # Check configurations (ModeConfig dataclass attributes)
         for mode in Mode:
             config = get_mode_config(mode)
-            assert "name" in config
-            assert "emoji" in config
-            assert "extended_thinking" in config
-            assert "style_guidance" in config
+            assert config.name
+            assert config.emoji
+            assert isinstance(config.extended_thinking, bool)
+            assert config.style_guidance
             print(f"   ✓ {mode.value} configuration valid")
 
         # Check buddy mode is rapid
         buddy_config = get_mode_config(Mode.BUDDY)
-        assert buddy_config["extended_thinking"] == False
+        assert buddy_config.extended_thinking == False
         print("   ✓ Buddy mode: rapid responses (no extended thinking)")
 
         # Check research mode has extended thinking
         research_config = get_mode_config(Mode.RESEARCH)
-        assert research_config["extended_thinking"] == True
-        assert research_config["budget_tokens"] > 0
-        print(f"   ✓ Research mode: extended thinking ({research_config['budget_tokens']} tokens)")
+        assert research_config.extended_thinking == True
+        assert research_config.budget_tokens > 0
+        print(f"   ✓ Research mode: extended thinking ({research_config.budget_tokens} tokens)")
 
         return True
 
@@ -155,10 +155,13 @@ def test_system_prompts():
         assert "thorough" in research_prompt or "academic" in research_prompt
         print("   ✓ Research mode prompt includes guidance")
 
-        # Check datetime present in both
-        assert "Current Date and Time" in buddy_prompt
-        assert "Current Date and Time" in research_prompt
-        print("   ✓ DateTime present in all mode prompts")
+        # The datetime lives in a separate system block so the static
+        # prompt stays cacheable — check the API params instead
+        system_text = "\n".join(
+            block["text"] for block in brain._build_api_params()["system"]
+        )
+        assert "Current Date and Time" in system_text
+        print("   ✓ DateTime present in system blocks")
 
         return True
 